@@ -3,8 +3,10 @@ Multi-agent system for CStarX v2.0
 """
 
 import asyncio
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+import os
+import re
+import time
+from typing import List, Dict, Optional, Any, Set, Tuple
 from pathlib import Path
 from loguru import logger
 
@@ -12,11 +14,107 @@ from ..models.project import Project, TranslationUnit, TranslationResult, Transl
 from ..models.config import Config
 from ..core.dependency_analyzer import DependencyAnalyzer
 from ..mcp import MCPClient, MCPTranslator
+from ..utils.temperature_optimizer import TemperatureOptimizer, TranslationAttempt
+from ..utils.compilation_verifier import CompilationVerifier, CompilationError
+from ..utils.error_fixer import ErrorFixer
+from ..utils.cargo import cargo_toml_content
+
+# Markers tallied by TechLeader._calculate_complexity in a single scan
+_COMPLEXITY_MARKERS = re.compile(r'\{|\}|class |template')
+
+# Markers QualityAgent._check_syntax looks for, found in a single scan
+_SYNTAX_MARKERS = re.compile(r'fn |\{|\}')
+
+# Compilation metadata recorded for headers, which are not verified on their own
+_HEADER_COMPILATION = {"success": True, "error_count": 0, "warning_count": 0}
+
+# Read size used when measuring sources that are not loaded yet
+_MEASURE_CHUNK_SIZE = 1 << 20
+
+# Characters carried between chunks so markers split across a boundary still match
+_MARKER_OVERLAP = len('template') - 1
+
+class _NullMCPTranslator:
+    """Stand-in used by TranslatorAgent when no MCP translator is configured"""
+    
+    async def translate_with_mcp(self, unit: TranslationUnit, project: Project, temperature: float) -> Dict[str, Any]:
+        """Return a placeholder translation"""
+        return {
+            'translated_code': f"// Translated from {unit.name}\n",
+            'confidence': 0.5,
+            'conversation': None
+        }
+
+
+def _count_complexity_markers(content: str, counts: Dict[str, int], skip: int = 0) -> None:
+    """Add marker occurrences in content to counts, ignoring matches ending within the first `skip` chars"""
+    for match in _COMPLEXITY_MARKERS.finditer(content):
+        if match.end() > skip:
+            counts[match.group()] += 1
+
+
+def _complexity_score(lines: int, counts: Dict[str, int]) -> float:
+    """Normalize line and marker counts into a complexity score"""
+    functions = counts['{'] - counts['}']
+    classes = counts['class ']
+    templates = counts['template']
+    return min(1.0, (lines / 1000) + (functions / 100) + (classes / 50) + (templates / 20))
+
+
+def _measure_source_file(file_path: Path) -> Tuple[int, Dict[str, int]]:
+    """Count lines and complexity markers in fixed-size chunks (blocking, run via asyncio.to_thread)"""
+    lines = 1
+    counts = {'{': 0, '}': 0, 'class ': 0, 'template': 0}
+    tail = ''
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(_MEASURE_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines += chunk.count('\n')
+            window = tail + chunk
+            _count_complexity_markers(window, counts, len(tail))
+            tail = window[-_MARKER_OVERLAP:]
+    return lines, counts
+
+
+def _read_text_file(file_path: Path) -> str:
+    """Read a source file (blocking, run via asyncio.to_thread)"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def _atomic_write(file_path: Path, content: str) -> None:
+    """Atomically replace a file, creating parent directories (blocking, run via asyncio.to_thread)
+    
+    The content goes to a sibling temp file which is then renamed over the
+    target, so a concurrent cargo check never reads a half-written file.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, file_path)
+
+
+def _write_text_file_if_changed(file_path: Path, content: str) -> bool:
+    """Write a file unless it already holds the same content (blocking)"""
+    if file_path.exists() and file_path.read_text(encoding='utf-8', errors='replace') == content:
+        return False
+    _atomic_write(file_path, content)
+    return True
 
 
 class BaseAgent:
     """Base class for all agents"""
     
+    __slots__ = ('config', 'name')
+    
     def __init__(self, config: Config):
         self.config = config
         self.name = self.__class__.__name__
@@ -30,9 +128,11 @@ class BaseAgent:
 class ProjectManager(BaseAgent):
     """Manages project lifecycle and coordinates other agents"""
     
+    __slots__ = ('dependency_analyzer', 'current_project', 'current_session')
+    
     def __init__(self, config: Config):
         super().__init__(config)
-        self.dependency_analyzer = DependencyAnalyzer(config.dependency)
+        self.dependency_analyzer = DependencyAnalyzer(config.dependency, Path(config.output.output_dir) / "state")
         self.current_project: Optional[Project] = None
         self.current_session: Optional[TranslationSession] = None
     
@@ -41,7 +141,6 @@ class ProjectManager(BaseAgent):
         logger.info(f"Initializing project: {project_path}")
         
         # Analyze project dependencies
-        from pathlib import Path
         project = await self.dependency_analyzer.analyze_project(Path(project_path))
         self.current_project = project
         
@@ -73,6 +172,8 @@ class ProjectManager(BaseAgent):
 class TechLeader(BaseAgent):
     """Technical leader responsible for code analysis and strategy"""
     
+    __slots__ = ('strategies', '_complexity_cache')
+    
     def __init__(self, config: Config):
         super().__init__(config)
         self.strategies = {
@@ -80,17 +181,23 @@ class TechLeader(BaseAgent):
             'complex': self._analyze_complex_code,
             'library': self._analyze_library_code
         }
+        # Complexity scores keyed by (unit id, content length)
+        self._complexity_cache: Dict[Tuple[str, int], float] = {}
     
     async def analyze_unit(self, unit: TranslationUnit) -> Dict[str, Any]:
         """Analyze a translation unit and determine strategy"""
         logger.info(f"Analyzing unit: {unit.name}")
         
-        # Calculate complexity score
-        complexity = await self._calculate_complexity(unit)
+        # Calculate complexity score; sources that are not loaded yet are
+        # measured by streaming the file instead of reading it whole
+        if unit.original_content:
+            complexity = self._calculate_complexity(unit)
+        else:
+            complexity = await self._measure_complexity(unit.path)
         unit.complexity_score = complexity
         
         # Determine strategy
-        strategy = await self._determine_strategy(unit)
+        strategy = self._determine_strategy(unit)
         
         # Generate analysis report
         analysis = {
@@ -104,24 +211,37 @@ class TechLeader(BaseAgent):
         logger.info(f"Analysis complete: {unit.name} - {strategy}")
         return analysis
     
-    async def _calculate_complexity(self, unit: TranslationUnit) -> float:
+    def _calculate_complexity(self, unit: TranslationUnit) -> float:
         """Calculate complexity score for a unit"""
         if not unit.original_content:
             return 0.0
         
         content = unit.original_content
+        cache_key = (unit.id, len(content))
+        cached = self._complexity_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Simple complexity metrics
-        lines = len(content.split('\n'))
-        functions = content.count('{') - content.count('}')
-        classes = content.count('class ')
-        templates = content.count('template')
+        # Simple complexity metrics, tallied in one pass over the content
+        lines = content.count('\n') + 1
+        counts = {'{': 0, '}': 0, 'class ': 0, 'template': 0}
+        _count_complexity_markers(content, counts)
         
         # Normalize complexity score
-        complexity = min(1.0, (lines / 1000) + (functions / 100) + (classes / 50) + (templates / 20))
+        complexity = _complexity_score(lines, counts)
+        self._complexity_cache[cache_key] = complexity
         return complexity
     
-    async def _determine_strategy(self, unit: TranslationUnit) -> str:
+    async def _measure_complexity(self, file_path: Path) -> float:
+        """Calculate complexity score for a source file that has not been loaded"""
+        try:
+            lines, counts = await asyncio.to_thread(_measure_source_file, Path(file_path))
+        except OSError as e:
+            logger.debug("Could not measure {}: {}", file_path, e)
+            return 0.0
+        return _complexity_score(lines, counts)
+    
+    def _determine_strategy(self, unit: TranslationUnit) -> str:
         """Determine translation strategy based on unit characteristics"""
         if unit.complexity_score < 0.3:
             return 'simple'
@@ -130,7 +250,7 @@ class TechLeader(BaseAgent):
         else:
             return 'library'
     
-    async def _analyze_simple_code(self, unit: TranslationUnit) -> Dict[str, Any]:
+    def _analyze_simple_code(self, unit: TranslationUnit) -> Dict[str, Any]:
         """Analyze simple code units"""
         return {
             'strategy': 'single_pass',
@@ -138,7 +258,7 @@ class TechLeader(BaseAgent):
             'parallel_workers': 1
         }
     
-    async def _analyze_complex_code(self, unit: TranslationUnit) -> Dict[str, Any]:
+    def _analyze_complex_code(self, unit: TranslationUnit) -> Dict[str, Any]:
         """Analyze complex code units"""
         return {
             'strategy': 'multi_pass',
@@ -146,7 +266,7 @@ class TechLeader(BaseAgent):
             'parallel_workers': 2
         }
     
-    async def _analyze_library_code(self, unit: TranslationUnit) -> Dict[str, Any]:
+    def _analyze_library_code(self, unit: TranslationUnit) -> Dict[str, Any]:
         """Analyze library code units"""
         return {
             'strategy': 'hybrid',
@@ -158,15 +278,21 @@ class TechLeader(BaseAgent):
 class TranslatorAgent(BaseAgent):
     """Agent responsible for actual code translation"""
     
+    __slots__ = (
+        'model_config', 'translation_config', 'mcp_client', 'mcp_translator',
+        'temp_optimizer', '_temp_projects'
+    )
+    
     def __init__(self, config: Config, mcp_client: Optional[MCPClient] = None, mcp_translator: Optional[MCPTranslator] = None):
         super().__init__(config)
         self.model_config = config.model
         self.translation_config = config.translation
         self.mcp_client = mcp_client
-        self.mcp_translator = mcp_translator
+        self.mcp_translator = mcp_translator or _NullMCPTranslator()
+        # Placeholder projects reused across retries, keyed by unit directory
+        self._temp_projects: Dict[Path, Project] = {}
         
         # Initialize temperature optimizer with DeepSeek recommended values
-        from ..utils.temperature_optimizer import TemperatureOptimizer
         self.temp_optimizer = TemperatureOptimizer(
             initial_temp=config.model.temperature
         )
@@ -175,7 +301,7 @@ class TranslatorAgent(BaseAgent):
         """Translate a single unit with temperature optimization and retry"""
         logger.info(f"Translating unit: {unit.name} with strategy: {strategy}")
         
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         # Load original content if not already loaded
         if not unit.original_content:
@@ -192,31 +318,39 @@ class TranslatorAgent(BaseAgent):
         
         # Try translation with temperature optimization
         temperatures_to_try = [base_temp]  # Start with adaptive temperature
+        tried_temperatures: Set[float] = set()
         attempt_count = 0
         
         while attempt_count <= max_retries and temperatures_to_try:
             if attempt_count > 0:
-                # On retry, get diverse temperatures for exploration
-                temperatures_to_try = self.temp_optimizer.get_retry_temperatures(
-                    base_temp, 
-                    num_retries=max_retries
-                )
+                # On retry, get diverse temperatures for exploration, skipping
+                # ones already tried (they would repeat the same request)
+                temperatures_to_try = [
+                    temp for temp in self.temp_optimizer.get_retry_temperatures(
+                        base_temp, 
+                        num_retries=max_retries
+                    )
+                    if round(temp, 2) not in tried_temperatures
+                ]
+                if not temperatures_to_try:
+                    logger.debug("No untried temperatures left for {}", unit.name)
+                    break
                 logger.info(f"Retry attempt {attempt_count} with temperatures: {temperatures_to_try}")
             
             for temp in temperatures_to_try:
+                if attempt_count > max_retries:
+                    break
+                temp_key = round(temp, 2)
+                if temp_key in tried_temperatures:
+                    continue
+                tried_temperatures.add(temp_key)
+                
                 attempt_count += 1
-                logger.debug(f"Attempt {attempt_count} with temperature {temp:.2f}")
+                logger.debug("Attempt {} with temperature {:.2f}", attempt_count, temp)
                 
                 try:
                     # Translate with specific temperature
-                    if strategy == 'single_pass':
-                        result_data = await self._single_pass_translation(unit, temp)
-                    elif strategy == 'multi_pass':
-                        result_data = await self._multi_pass_translation(unit, temp)
-                    elif strategy == 'hybrid':
-                        result_data = await self._hybrid_translation(unit, temp)
-                    else:
-                        result_data = await self._adaptive_translation(unit, temp)
+                    result_data = await self._run_mcp_translation(unit, temp)
                     
                     # Extract data from dict format (all methods now return dict)
                     if not isinstance(result_data, dict):
@@ -239,7 +373,6 @@ class TranslatorAgent(BaseAgent):
                         continue
                     
                     # Record successful attempt
-                    from ..utils.temperature_optimizer import TranslationAttempt
                     attempt = TranslationAttempt(
                         temperature=temp,
                         success=True,
@@ -259,7 +392,7 @@ class TranslatorAgent(BaseAgent):
                     
                     # If confidence is high enough, accept this result
                     if confidence >= 0.7:
-                        translation_time = (datetime.now() - start_time).total_seconds()
+                        translation_time = time.perf_counter() - start_time
                         
                         # Collect conversation history for this attempt
                         conversation_history = []
@@ -287,23 +420,19 @@ class TranslatorAgent(BaseAgent):
                     logger.warning(f"Translation attempt {attempt_count} failed: {e}")
                     
                     # Record failed attempt
-                    from ..utils.temperature_optimizer import TranslationAttempt
                     attempt = TranslationAttempt(
                         temperature=temp,
                         success=False,
                         error_message=str(e)
                     )
                     self.temp_optimizer.update_from_attempt(attempt)
-                    
-                    if attempt_count > max_retries:
-                        break
             
             # If we tried all temperatures and none succeeded, use best result if available
             if best_result and attempt_count > max_retries // 2:
                 break
         
         # Return best result or failure
-        translation_time = (datetime.now() - start_time).total_seconds()
+        translation_time = time.perf_counter() - start_time
         
         if best_result:
             # best_result is always a dict now
@@ -339,96 +468,31 @@ class TranslatorAgent(BaseAgent):
     
     async def _load_file_content(self, file_path: str) -> str:
         """Load file content"""
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
-    
-    async def _single_pass_translation(self, unit: TranslationUnit, temperature: float) -> Dict[str, Any]:
-        """Single pass translation with MCP"""
-        if self.mcp_translator:
-            # Get the actual project from orchestrator
-            # We need to get the project properly - for now, create a minimal one
-            from ..models.project import Project
-            project = Project(name="temp", path=unit.path.parent)
-            result = await self.mcp_translator.translate_with_mcp(unit, project, temperature)
-            
-            # Handle both dict and tuple return formats
-            if isinstance(result, dict):
-                return result
-            else:
-                # Legacy tuple format - convert to dict
-                translated_code, confidence = result
-                return {
-                    'translated_code': translated_code,
-                    'confidence': confidence,
-                    'conversation': None
-                }
-        # Fallback to basic translation
-        return {
-            'translated_code': f"// Translated from {unit.name}\n// Single pass translation\n",
-            'confidence': 0.5,
-            'conversation': None
-        }
-    
-    async def _multi_pass_translation(self, unit: TranslationUnit, temperature: float) -> Dict[str, Any]:
-        """Multi-pass translation with MCP"""
-        if self.mcp_translator:
-            from ..models.project import Project
-            project = Project(name="temp", path=unit.path.parent)
-            result = await self.mcp_translator.translate_with_mcp(unit, project, temperature)
-            if isinstance(result, dict):
-                return result
-            else:
-                translated_code, confidence = result
-                return {
-                    'translated_code': translated_code,
-                    'confidence': confidence,
-                    'conversation': None
-                }
-        return {
-            'translated_code': f"// Translated from {unit.name}\n// Multi-pass translation\n",
-            'confidence': 0.5,
-            'conversation': None
-        }
+        return await asyncio.to_thread(_read_text_file, Path(file_path))
     
-    async def _hybrid_translation(self, unit: TranslationUnit, temperature: float) -> Dict[str, Any]:
-        """Hybrid translation with MCP"""
-        if self.mcp_translator:
-            from ..models.project import Project
+    async def _run_mcp_translation(self, unit: TranslationUnit, temperature: float) -> Dict[str, Any]:
+        """Translate a unit with MCP (a placeholder stub when MCP is unavailable)"""
+        # Get the actual project from orchestrator
+        # We need to get the project properly - for now, use a minimal one per directory
+        project = self._temp_projects.get(unit.path.parent)
+        if project is None:
             project = Project(name="temp", path=unit.path.parent)
-            result = await self.mcp_translator.translate_with_mcp(unit, project, temperature)
-            if isinstance(result, dict):
-                return result
-            else:
-                translated_code, confidence = result
-                return {
-                    'translated_code': translated_code,
-                    'confidence': confidence,
-                    'conversation': None
-                }
-        return {
-            'translated_code': f"// Translated from {unit.name}\n// Hybrid translation\n",
-            'confidence': 0.5,
-            'conversation': None
-        }
+            self._temp_projects[unit.path.parent] = project
+        return self._coerce_result(
+            await self.mcp_translator.translate_with_mcp(unit, project, temperature)
+        )
     
-    async def _adaptive_translation(self, unit: TranslationUnit, temperature: float) -> Dict[str, Any]:
-        """Adaptive translation with MCP"""
-        if self.mcp_translator:
-            from ..models.project import Project
-            project = Project(name="temp", path=unit.path.parent)
-            result = await self.mcp_translator.translate_with_mcp(unit, project, temperature)
-            if isinstance(result, dict):
-                return result
-            else:
-                translated_code, confidence = result
-                return {
-                    'translated_code': translated_code,
-                    'confidence': confidence,
-                    'conversation': None
-                }
+    @staticmethod
+    def _coerce_result(result: Any) -> Dict[str, Any]:
+        """Normalize a translation result to dict format"""
+        # Handle both dict and tuple return formats
+        if isinstance(result, dict):
+            return result
+        # Legacy tuple format - convert to dict
+        translated_code, confidence = result
         return {
-            'translated_code': f"// Translated from {unit.name}\n// Adaptive translation\n",
-            'confidence': 0.5,
+            'translated_code': translated_code,
+            'confidence': confidence,
             'conversation': None
         }
 
@@ -436,6 +500,8 @@ class TranslatorAgent(BaseAgent):
 class QualityAgent(BaseAgent):
     """Agent responsible for quality assurance"""
     
+    __slots__ = ()
+    
     def __init__(self, config: Config):
         super().__init__(config)
     
@@ -448,13 +514,13 @@ class QualityAgent(BaseAgent):
         content = result.translated_content
         
         # Check for basic Rust syntax
-        syntax_score = await self._check_syntax(content)
+        syntax_score = self._check_syntax(content)
         
         # Check for completeness
-        completeness_score = await self._check_completeness(content)
+        completeness_score = self._check_completeness(content)
         
         # Check for style
-        style_score = await self._check_style(content)
+        style_score = self._check_style(content)
         
         # Calculate overall quality score
         quality_score = (syntax_score + completeness_score + style_score) / 3
@@ -462,21 +528,24 @@ class QualityAgent(BaseAgent):
         logger.info(f"Quality check complete: {quality_score:.2f}")
         return quality_score
     
-    async def _check_syntax(self, content: str) -> float:
+    def _check_syntax(self, content: str) -> float:
         """Check Rust syntax"""
-        # Simple syntax checks
-        if 'fn ' in content and '{' in content and '}' in content:
-            return 0.8
+        # Simple syntax checks: stop scanning once every marker has been seen
+        seen = set()
+        for match in _SYNTAX_MARKERS.finditer(content):
+            seen.add(match.group())
+            if len(seen) == 3:
+                return 0.8
         return 0.3
     
-    async def _check_completeness(self, content: str) -> float:
+    def _check_completeness(self, content: str) -> float:
         """Check translation completeness"""
         # Simple completeness checks
         if len(content.strip()) > 10:
             return 0.7
         return 0.2
     
-    async def _check_style(self, content: str) -> float:
+    def _check_style(self, content: str) -> float:
         """Check code style"""
         # Simple style checks
         if content.startswith('//') or content.startswith('/*'):
@@ -487,13 +556,39 @@ class QualityAgent(BaseAgent):
 class AgentOrchestrator:
     """Orchestrates the multi-agent system"""
     
+    __slots__ = (
+        'config', 'mcp_client', 'mcp_translator', 'project_manager', 'tech_leader',
+        'translator', 'quality_agent', 'error_fixer', '_verifiers',
+        '_write_queue', '_writer_task', '_dirty_units', '_save_event', '_saver_stop',
+        '_saver_task'
+    )
+    
+    # Maximum number of intermediate file writes waiting for the writer
+    WRITE_QUEUE_SIZE = 256
+    
+    # Seconds between coalesced unit state saves
+    SAVE_INTERVAL = 2.0
+    
     def __init__(self, config: Config, mcp_client: Optional[MCPClient] = None, mcp_translator: Optional[MCPTranslator] = None):
         self.config = config
         self.mcp_client = mcp_client
+        self.mcp_translator = mcp_translator
         self.project_manager = ProjectManager(config)
         self.tech_leader = TechLeader(config)
         self.translator = TranslatorAgent(config, mcp_client, mcp_translator)
         self.quality_agent = QualityAgent(config)
+        # Shared by every fix round so they reuse one LLM client
+        self.error_fixer = ErrorFixer(config)
+        # Compilation verifiers keyed by crate directory
+        self._verifiers: Dict[Path, CompilationVerifier] = {}
+        # Background writer for intermediate files, running during translate_project
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Units changed since the last state save, flushed by the saver task
+        self._dirty_units: Dict[str, TranslationUnit] = {}
+        self._save_event: Optional[asyncio.Event] = None
+        self._saver_stop: Optional[asyncio.Event] = None
+        self._saver_task: Optional[asyncio.Task] = None
         
         logger.info("Agent orchestrator initialized with MCP support")
     
@@ -522,25 +617,166 @@ class AgentOrchestrator:
         if state_manager:
             await state_manager.save_project(project)
         
-        # Process units in parallel
+        # Every unit starts as soon as its own dependencies finish, signalled
+        # through one event per unit. Compilation is still verified level by
+        # level, overlapping with translation of the deeper levels.
         semaphore = asyncio.Semaphore(self.config.translation.max_parallel_workers)
+        dependency_map = project.get_dependency_map()
+        levels = project.get_depth_levels(dependency_map)
+        done_events = {unit.id: asyncio.Event() for unit in project.units}
+        logger.info(f"Scheduling {len(project.units)} units in {len(levels)} dependency levels")
         
-        tasks = []
-        for unit in project.units:
-            task = self._process_unit(unit, semaphore, project, state_manager)
-            tasks.append(task)
+        level_tasks = []
+        for level in levels:
+            level_ids = {unit.id for unit in level}
+            level_tasks.append([
+                asyncio.create_task(self._process_unit_when_ready(
+                    unit,
+                    # Units in a dependency cycle share the last level and
+                    # do not wait on each other
+                    [done_events[dep_id] for dep_id in dependency_map[unit.id] - level_ids],
+                    done_events[unit.id],
+                    semaphore,
+                    project
+                ))
+                for unit in level
+            ])
         
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks)
-        
-        # Update final statistics and save
-        project.update_statistics()
+        self._start_writer()
         if state_manager:
-            await state_manager.save_project(project)
+            self._start_saver(project, state_manager)
+        try:
+            for depth, (level, tasks) in enumerate(zip(levels, level_tasks)):
+                logger.debug("Waiting for dependency level {}: {} units", depth, len(level))
+                await asyncio.gather(*tasks)
+                await self._verify_level_compilation(level, project, semaphore)
+            await self._flush_writes()
+        except BaseException:
+            # Don't leave units translating in the background
+            for tasks in level_tasks:
+                for task in tasks:
+                    task.cancel()
+            raise
+        finally:
+            self._stop_writer()
+            await self._stop_saver()
+            await self.error_fixer.close()
+            # Runs on failure and cancellation too, so finished units aren't lost
+            project.update_statistics()
+            if state_manager:
+                await state_manager.save_project(project)
+                await self._save_session(state_manager)
         
         logger.info("Project translation complete")
         return project
     
+    def _start_saver(self, project: Project, state_manager) -> None:
+        """Start the background task that coalesces unit and session state saves"""
+        self._dirty_units.clear()
+        self._save_event = asyncio.Event()
+        self._saver_stop = asyncio.Event()
+        self._saver_task = asyncio.create_task(
+            self._saver_loop(project, state_manager, self._save_event, self._saver_stop)
+        )
+    
+    async def _stop_saver(self) -> None:
+        """Stop the saver, letting a save in progress finish first
+        
+        Units still pending are left to the caller's final save_project,
+        which rewrites every unit anyway.
+        """
+        task, event, stop = self._saver_task, self._save_event, self._saver_stop
+        self._save_event = None
+        self._saver_stop = None
+        self._saver_task = None
+        self._dirty_units.clear()
+        if task is None:
+            return
+        
+        stop.set()
+        event.set()
+        try:
+            await task
+        except Exception as e:
+            logger.error(f"Background state save failed: {e}")
+    
+    async def _saver_loop(self, project: Project, state_manager, event: asyncio.Event, stop: asyncio.Event) -> None:
+        """Save changed units, and the session they updated, at most once per SAVE_INTERVAL"""
+        while True:
+            await event.wait()
+            if not stop.is_set():
+                # Coalesce a burst of completions; a stop request cuts the wait short
+                try:
+                    await asyncio.wait_for(stop.wait(), self.SAVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            if stop.is_set():
+                return
+            event.clear()
+            units = list(self._dirty_units.values())
+            self._dirty_units.clear()
+            try:
+                await state_manager.save_units(project, units)
+                await self._save_session(state_manager)
+            except Exception as e:
+                # Keep checkpointing: retry these units on the next tick,
+                # unless they were changed (and re-queued) in the meantime
+                for unit in units:
+                    self._dirty_units.setdefault(unit.id, unit)
+                event.set()
+                logger.warning(f"Failed to save project state, retrying: {e}")
+                continue
+            logger.debug("Project state saved: {}/{} units processed", project.translated_files + project.failed_files, project.total_files)
+    
+    async def _save_session(self, state_manager) -> None:
+        """Persist the current session; every unit completion updates it"""
+        session = self.project_manager.current_session
+        if session:
+            await state_manager.save_session(session)
+    
+    def _schedule_unit_save(self, unit: TranslationUnit) -> None:
+        """Mark a unit's state for the next coalesced save"""
+        if self._save_event is not None:
+            self._dirty_units[unit.id] = unit
+            self._save_event.set()
+    
+    def _start_writer(self) -> None:
+        """Start the background task that writes intermediate files"""
+        self._write_queue = asyncio.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._writer_loop(self._write_queue))
+    
+    def _stop_writer(self) -> None:
+        """Stop the background writer; pending writes should be flushed first"""
+        if self._writer_task:
+            self._writer_task.cancel()
+        self._write_queue = None
+        self._writer_task = None
+    
+    async def _writer_loop(self, queue: asyncio.Queue) -> None:
+        """Write queued intermediate files one at a time"""
+        while True:
+            unit, project = await queue.get()
+            try:
+                await self._write_intermediate_file(unit, project)
+            finally:
+                queue.task_done()
+    
+    async def _queue_intermediate_file(self, unit: TranslationUnit, project: Project) -> None:
+        """Hand an intermediate file to the background writer
+        
+        Writes directly when no writer is running (outside translate_project).
+        Waits only when the queue is full.
+        """
+        if self._write_queue is None:
+            await self._write_intermediate_file(unit, project)
+        else:
+            await self._write_queue.put((unit, project))
+    
+    async def _flush_writes(self) -> None:
+        """Wait until every queued intermediate file has been written"""
+        if self._write_queue is not None:
+            await self._write_queue.join()
+    
     async def _write_intermediate_file(self, unit: TranslationUnit, project: Project) -> None:
         """Write intermediate Rust file immediately after translation"""
         if not unit.translated_content:
@@ -551,28 +787,16 @@ class AgentOrchestrator:
             output_dir = Path(self.config.output.output_dir)
             project_output_dir = output_dir / project.name
             
-            # Get relative path from project root
-            try:
-                relative_path = unit.path.relative_to(project.path)
-            except ValueError:
-                relative_path = Path(unit.path.name)
-            
             # Create Rust file path
-            rust_file_path = project_output_dir / relative_path
-            rust_file_path = rust_file_path.with_suffix('.rs')
-            
-            # Create output directory
-            rust_file_path.parent.mkdir(parents=True, exist_ok=True)
+            rust_file_path = self._rust_file_path(unit, project)
             
-            # Write translated content
-            with open(rust_file_path, 'w', encoding='utf-8') as f:
-                f.write(unit.translated_content)
+            # Create output directory and write translated content off the event loop
+            await asyncio.to_thread(_atomic_write, rust_file_path, unit.translated_content)
             
-            file_size = len(unit.translated_content)
-            logger.info(f"✓ Intermediate file generated: {rust_file_path} ({file_size} bytes)")
+            logger.debug("[FILE] {} written to {} ({} bytes)", unit.name, rust_file_path, len(unit.translated_content))
             
             # Update Cargo.toml if needed (first file or periodically)
-            completed_count = len([u for u in project.units if u.status == TranslationStatus.COMPLETED])
+            completed_count = project.translated_files
             if completed_count == 1 or completed_count % 10 == 0:
                 await self._update_cargo_toml(project, project_output_dir)
         
@@ -583,27 +807,107 @@ class AgentOrchestrator:
         """Update Cargo.toml with current modules"""
         cargo_toml_path = output_dir / "Cargo.toml"
         
-        # Safe project name
-        safe_name = project.name.lower().replace(' ', '-').replace('_', '-')
-        safe_name = ''.join(c for c in safe_name if c.isalnum() or c == '-')
-        if not safe_name or safe_name[0].isdigit():
-            safe_name = f"translated-{safe_name}"
-        
-        # Generate basic Cargo.toml
-        cargo_content = f"""[package]
-name = "{safe_name}"
-version = "0.1.0"
-edition = "2021"
-
-[dependencies]
-# Add dependencies as needed
-# libc = "0.2"
-"""
+        cargo_content = cargo_toml_content(project.name)
+        
+        # Skip the write when the manifest on disk is already up to date
+        if await asyncio.to_thread(_write_text_file_if_changed, cargo_toml_path, cargo_content):
+            logger.debug(f"Cargo.toml updated: {cargo_toml_path}")
+    
+    async def _verify_level_compilation(
+        self,
+        level: List[TranslationUnit],
+        project: Project,
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        """Verify compilation for a finished dependency level with one cargo check
+        
+        Diagnostics are grouped per file; only units with errors go through
+        the per-file fix loop.
+        """
+        project_output_dir = Path(self.config.output.output_dir) / project.name
+        rust_files: Dict[str, TranslationUnit] = {}
+        
+        # The level's files must be on disk before cargo sees them
+        await self._flush_writes()
+        
+        for unit in level:
+            if unit.status != TranslationStatus.COMPLETED or not unit.translation_result:
+                continue
+            
+            # Skip compilation verification for header files (they need implementation files to compile)
+            if unit.type == TranslationUnitType.PURE_HEADER:
+                logger.debug("Skipping compilation verification for header file: {} (headers need implementations to compile)", unit.name)
+                unit.translation_result.metadata["compilation"] = _HEADER_COMPILATION.copy()
+                continue
+            
+            rust_files[str(self._rust_file_path(unit, project))] = unit
+        
+        if not rust_files:
+            return
+        
+        # Queued writes may finish out of order, so make sure the manifest exists
+        await self._update_cargo_toml(project, project_output_dir)
+        
+        verifier = self._get_verifier(project_output_dir)
+        results = await verifier.verify_batch(list(rust_files))
+        
+        await asyncio.gather(*(
+            self._finish_unit_compilation(unit, results[rust_file], project, semaphore)
+            for rust_file, unit in rust_files.items()
+        ))
+    
+    async def _finish_unit_compilation(
+        self,
+        unit: TranslationUnit,
+        compilation_result: Dict[str, Any],
+        project: Project,
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        """Fix a unit's compilation errors if any and record the outcome"""
+        result = unit.translation_result
+        
+        if not compilation_result["success"] and compilation_result.get("error_count", 0) > 0:
+            async with semaphore:
+                # Try to fix errors with LLM
+                fixed_result = await self._fix_compilation_errors(
+                    unit,
+                    result.translated_content,
+                    compilation_result["errors"],
+                    project
+                )
+                
+                if fixed_result["success"]:
+                    result.translated_content = fixed_result["fixed_code"]
+                    unit.translated_content = result.translated_content
+                    logger.info(f"✓ Fixed {len(fixed_result.get('fixed_errors', []))} compilation errors for {unit.name}")
+                    # Verify again after fix
+                    compilation_result = await self._verify_file_compilation(unit, result.translated_content, project)
+                    if compilation_result["success"]:
+                        logger.info(f"✓ File compiles successfully after fix: {unit.name}")
+                    else:
+                        logger.warning(f"⚠ File still has compilation errors after fix: {unit.name}")
+                else:
+                    logger.warning(f"⚠ Could not fix all compilation errors for {unit.name}")
         
-        with open(cargo_toml_path, 'w', encoding='utf-8') as f:
-            f.write(cargo_content)
+        # Store compilation result in metadata
+        result.metadata["compilation"] = {
+            "success": compilation_result["success"],
+            "error_count": compilation_result.get("error_count", 0),
+            "warning_count": compilation_result.get("warning_count", 0)
+        }
         
-        logger.debug(f"Cargo.toml updated: {cargo_toml_path}")
+        self._schedule_unit_save(unit)
+    
+    def _rust_file_path(self, unit: TranslationUnit, project: Project) -> Path:
+        """Get the output .rs path for a unit"""
+        project_output_dir = Path(self.config.output.output_dir) / project.name
+        
+        try:
+            relative_path = unit.path.relative_to(project.path)
+        except ValueError:
+            relative_path = Path(unit.path.name)
+        
+        return project_output_dir / relative_path.with_suffix('.rs')
     
     async def _verify_file_compilation(
         self,
@@ -612,22 +916,15 @@ edition = "2021"
         project: Project
     ) -> Dict[str, Any]:
         """Verify file compilation in actual project context with detailed error analysis"""
-        from ..utils.compilation_verifier import CompilationVerifier
         
         project_output_dir = Path(self.config.output.output_dir) / project.name
         
         # Ensure file is written first
-        try:
-            relative_path = unit.path.relative_to(project.path)
-        except ValueError:
-            relative_path = Path(unit.path.name)
-        
-        rust_file_path = project_output_dir / relative_path.with_suffix('.rs')
-        rust_file_path.parent.mkdir(parents=True, exist_ok=True)
-        rust_file_path.write_text(translated_code)
+        rust_file_path = self._rust_file_path(unit, project)
+        await asyncio.to_thread(_atomic_write, rust_file_path, translated_code)
         
         # Use actual project directory for verification
-        verifier = CompilationVerifier(project_output_dir)
+        verifier = self._get_verifier(project_output_dir)
         result = await verifier.verify_file(str(rust_file_path))
         
         return result
@@ -640,10 +937,6 @@ edition = "2021"
         project: Project
     ) -> Dict[str, Any]:
         """Fix compilation errors using LLM-assisted iterative refinement"""
-        from ..utils.error_fixer import ErrorFixer
-        from ..utils.compilation_verifier import CompilationError
-        
-        fixer = ErrorFixer(self.config)
         
         # Convert error dicts to CompilationError objects
         compilation_errors = [CompilationError(e) for e in errors]
@@ -651,12 +944,7 @@ edition = "2021"
         project_output_dir = Path(self.config.output.output_dir) / project.name
         
         # Determine file path
-        try:
-            relative_path = unit.path.relative_to(project.path)
-        except ValueError:
-            relative_path = Path(unit.path.name)
-        
-        rust_file_path = project_output_dir / relative_path.with_suffix('.rs')
+        rust_file_path = self._rust_file_path(unit, project)
         
         project_context = {
             "project_dir": str(project_output_dir),
@@ -664,7 +952,7 @@ edition = "2021"
             "file_path": str(rust_file_path)
         }
         
-        result = await fixer.fix_compile_errors(
+        result = await self.error_fixer.fix_compile_errors(
             code=code,
             errors=compilation_errors,
             filepath=str(rust_file_path),
@@ -673,96 +961,72 @@ edition = "2021"
         
         # Update the file if fix was successful
         if result["success"]:
-            rust_file_path.write_text(result["fixed_code"])
+            await asyncio.to_thread(_atomic_write, rust_file_path, result["fixed_code"])
             logger.info(f"Updated file with fixed code: {rust_file_path}")
         
         return result
     
     async def _verify_module_compilation(self, module_path: Path) -> Dict[str, Any]:
         """Verify a module compiles independently in its own context"""
-        from ..utils.compilation_verifier import CompilationVerifier
         
-        verifier = CompilationVerifier(module_path)
+        verifier = self._get_verifier(module_path)
         return await verifier.verify_module(module_path)
     
-    async def _process_unit(self, unit: TranslationUnit, semaphore: asyncio.Semaphore, project: Project, state_manager=None) -> None:
+    def _get_verifier(self, crate_dir: Path) -> CompilationVerifier:
+        """Get the cached compilation verifier for a crate directory"""
+        verifier = self._verifiers.get(crate_dir)
+        if verifier is None:
+            verifier = CompilationVerifier(crate_dir)
+            self._verifiers[crate_dir] = verifier
+        return verifier
+    
+    async def _process_unit_when_ready(
+        self,
+        unit: TranslationUnit,
+        dependency_events: List[asyncio.Event],
+        done_event: asyncio.Event,
+        semaphore: asyncio.Semaphore,
+        project: Project
+    ) -> None:
+        """Process a unit once all of its dependencies have finished"""
+        try:
+            for event in dependency_events:
+                await event.wait()
+            await self._process_unit(unit, semaphore, project)
+        finally:
+            # Failed units release their dependents too, as before
+            done_event.set()
+    
+    async def _process_unit(self, unit: TranslationUnit, semaphore: asyncio.Semaphore, project: Project) -> None:
         """Process a single translation unit"""
         async with semaphore:
-            # Wait for dependencies to be ready
-            await self._wait_for_dependencies(unit, project)
-            
             # Mark unit as in progress
-            unit.status = TranslationStatus.IN_PROGRESS
+            project.set_unit_status(unit, TranslationStatus.IN_PROGRESS)
             
             # Analyze unit
             analysis = await self.tech_leader.analyze_unit(unit)
             
             # Translate unit
-            logger.info(f"[TRANSLATION] Starting translation for: {unit.name}, strategy={analysis.get('strategy', 'unknown')}")
+            logger.debug("[TRANSLATION] Starting translation for: {}, strategy={}", unit.name, analysis.get('strategy', 'unknown'))
             result = await self.translator.translate_unit(unit, analysis['strategy'])
-            logger.info(f"[TRANSLATION] Translation result for {unit.name}: success={result.success}, content_length={len(result.translated_content) if result.translated_content else 0}")
+            logger.debug("[TRANSLATION] Translation result for {}: success={}, content_length={}", unit.name, result.success, len(result.translated_content or ''))
             
-            # Check quality and verify compilation
+            # Check quality; compilation is verified once per dependency level
             if result.success:
                 logger.info(f"[SUCCESS] Translation succeeded for {unit.name}")
-                quality_score = await self.quality_agent.check_quality(result)
-                result.quality_score = quality_score
-                
-                # Verify compilation in actual project context with detailed error analysis
-                # Skip compilation verification for header files (they need implementation files to compile)
-                if unit.type == TranslationUnitType.PURE_HEADER:
-                    logger.debug(f"Skipping compilation verification for header file: {unit.name} (headers need implementations to compile)")
-                    compilation_result = {
-                        "success": True,  # Consider headers as successfully verified (syntax check passed)
-                        "error_count": 0,
-                        "warning_count": 0,
-                        "errors": [],
-                        "warnings": [],
-                        "note": "Header file - compilation verification skipped (requires implementation to verify)"
-                    }
-                else:
-                    compilation_result = await self._verify_file_compilation(unit, result.translated_content, project)
-                
-                if not compilation_result["success"] and compilation_result.get("error_count", 0) > 0:
-                    # Try to fix errors with LLM
-                    fixed_result = await self._fix_compilation_errors(
-                        unit,
-                        result.translated_content,
-                        compilation_result["errors"],
-                        project
-                    )
-                    
-                    if fixed_result["success"]:
-                        result.translated_content = fixed_result["fixed_code"]
-                        logger.info(f"✓ Fixed {len(fixed_result.get('fixed_errors', []))} compilation errors for {unit.name}")
-                        # Verify again after fix
-                        compilation_result = await self._verify_file_compilation(unit, result.translated_content, project)
-                        if compilation_result["success"]:
-                            logger.info(f"✓ File compiles successfully after fix: {unit.name}")
-                        else:
-                            logger.warning(f"⚠ File still has compilation errors after fix: {unit.name}")
-                    else:
-                        logger.warning(f"⚠ Could not fix all compilation errors for {unit.name}")
-                
-                # Store compilation result in metadata
-                result.metadata["compilation"] = {
-                    "success": compilation_result["success"],
-                    "error_count": compilation_result.get("error_count", 0),
-                    "warning_count": compilation_result.get("warning_count", 0)
-                }
                 
                 # Store translation result in unit
                 unit.translated_content = result.translated_content
-                unit.status = TranslationStatus.COMPLETED
+                project.set_unit_status(unit, TranslationStatus.COMPLETED)
                 unit.translation_result = result
                 
-                # Write intermediate file immediately (real-time generation)
-                logger.info(f"[FILE] Writing intermediate file for completed unit: {unit.name}")
-                await self._write_intermediate_file(unit, project)
-                logger.info(f"[FILE] Intermediate file successfully written for: {unit.name}")
+                # Queue the intermediate file (real-time generation); the
+                # background writer overlaps it with quality scoring
+                await self._queue_intermediate_file(unit, project)
+                result.quality_score = await self.quality_agent.check_quality(result)
             else:
                 logger.error(f"[FAILED] Translation failed for {unit.name}: {result.error_message}")
-                unit.status = TranslationStatus.FAILED
+                project.set_unit_status(unit, TranslationStatus.FAILED)
                 unit.error_message = result.error_message
                 unit.translation_result = result
                 
@@ -770,44 +1034,10 @@ edition = "2021"
                 if result.translated_content and len(result.translated_content.strip()) > 10:
                     logger.warning(f"[FILE] Writing partial translation for failed unit: {unit.name} ({len(result.translated_content)} bytes)")
                     unit.translated_content = result.translated_content
-                    await self._write_intermediate_file(unit, project)
+                    await self._queue_intermediate_file(unit, project)
             
             # Update session
             await self.project_manager.update_session(result)
             
-            # Update project statistics
-            project.update_statistics()
-            
-            # Save project state periodically (every 5 units or on completion/failure)
-            if state_manager:
-                # Get completed and failed counts to determine when to save
-                completed = len([u for u in project.units if u.status == TranslationStatus.COMPLETED])
-                failed = len([u for u in project.units if u.status == TranslationStatus.FAILED])
-                
-                # Save if it's a milestone (every 5 units) or this is a completed/failed unit
-                if (completed + failed) % 5 == 0 or unit.status in [TranslationStatus.COMPLETED, TranslationStatus.FAILED]:
-                    await state_manager.save_project(project)
-                    logger.debug(f"Project state saved: {completed + failed}/{project.total_files} units processed")
-    
-    async def _wait_for_dependencies(self, unit: TranslationUnit, project: Optional[Project] = None) -> None:
-        """Wait for unit dependencies to be ready"""
-        if not self.project_manager.current_session:
-            return
-        
-        # Use project from project_manager if not provided
-        if project is None:
-            project = self.project_manager.current_project
-        
-        completed_units = self.project_manager.current_session.completed_units
-        
-        max_wait_time = 300.0  # Maximum wait time in seconds (5 minutes)
-        start_time = asyncio.get_event_loop().time()
-        wait_interval = 0.5  # Check every 0.5 seconds
-        
-        while not unit.is_ready_for_translation(completed_units, project=project):
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > max_wait_time:
-                logger.warning(f"Timeout waiting for dependencies of {unit.name} after {max_wait_time}s, proceeding anyway")
-                break
-            await asyncio.sleep(wait_interval)
-            completed_units = self.project_manager.current_session.completed_units
+            # Persist just this unit (coalesced); the full project is saved once the run completes
+            self._schedule_unit_save(unit)
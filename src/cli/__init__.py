@@ -3,22 +3,37 @@ CLI interface for CStarX v2.0
 """
 
 import asyncio
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
 from loguru import logger
 
-from ..core.translator import Translator
 from ..models.config import Config
-from ..utils.progress_viewer import ProgressViewer
+
+# Heavier modules (the translator stack, rich tables/progress, the progress
+# viewer) are imported by the commands that use them to keep startup fast
+if TYPE_CHECKING:
+    from ..core.translator import Translator
 
 app = typer.Typer(name="cstarx", help="CStarX v2.0 - Advanced C/C++ to Rust Translation Tool")
 console = Console()
 
 
+@functools.lru_cache(maxsize=1)
+def _get_config() -> Config:
+    """Load the environment configuration once per process"""
+    return Config.from_env()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_translator() -> "Translator":
+    """Get the shared translator used by the status/resume/pause/clean commands"""
+    from ..core.translator import Translator
+    return Translator(_get_config())
+
+
 @app.command()
 def translate(
     project_path: str = typer.Argument(..., help="Path to the C/C++ project"),
@@ -33,7 +48,7 @@ def translate(
     if config_file:
         config = Config.load(Path(config_file))
     else:
-        config = Config.from_env()
+        config = _get_config()
     
     if dev_mode:
         config.dev_mode = True
@@ -96,7 +111,7 @@ def status(
     """Check translation status"""
     if all_projects or project_id or project_name:
         # Use progress viewer
-        from pathlib import Path
+        from ..utils.progress_viewer import ProgressViewer
         viewer = ProgressViewer(state_dir=Path(state_dir) if state_dir else None)
         if project_id:
             viewer.display_project_details(project_id=project_id)
@@ -133,6 +148,9 @@ def clean():
 
 async def _run_translation(project_path: str, output_path: Optional[str], config: Config):
     """Run the translation process"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from ..core.translator import Translator
+    
     translator = Translator(config)
     
     with Progress(
@@ -162,8 +180,7 @@ async def _run_translation(project_path: str, output_path: Optional[str], config
 
 async def _check_status(project_path: Optional[str]):
     """Check translation status"""
-    config = Config.from_env()
-    translator = Translator(config)
+    translator = _get_translator()
     
     status = await translator.get_translation_status()
     
@@ -172,6 +189,7 @@ async def _check_status(project_path: Optional[str]):
         return
     
     # Display status table
+    from rich.table import Table
     table = Table(title="Translation Status")
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="magenta")
@@ -193,8 +211,7 @@ async def _check_status(project_path: Optional[str]):
 
 async def _resume_translation(project_path: str):
     """Resume translation"""
-    config = Config.from_env()
-    translator = Translator(config)
+    translator = _get_translator()
     
     try:
         await translator.resume_translation()
@@ -206,8 +223,7 @@ async def _resume_translation(project_path: str):
 
 async def _pause_translation(project_path: str):
     """Pause translation"""
-    config = Config.from_env()
-    translator = Translator(config)
+    translator = _get_translator()
     
     try:
         await translator.pause_translation()
@@ -219,8 +235,7 @@ async def _pause_translation(project_path: str):
 
 async def _cleanup():
     """Clean up old state files"""
-    config = Config.from_env()
-    translator = Translator(config)
+    translator = _get_translator()
     
     await translator.cleanup()
     console.print("[green]Cleanup complete[/green]")
@@ -228,6 +243,7 @@ async def _cleanup():
 
 def _display_results(project):
     """Display translation results"""
+    from rich.table import Table
     table = Table(title="Translation Results")
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="magenta")
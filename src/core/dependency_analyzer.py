@@ -2,17 +2,47 @@
 Core dependency analysis engine for CStarX v2.0
 """
 
+import asyncio
 import os
+import re
 import subprocess
+import sys
 import json
-from typing import List, Dict, Set, Optional, Tuple
+from array import array
+from collections import deque
+from typing import Callable, FrozenSet, List, Dict, Set, Optional, Tuple, Any
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from loguru import logger
 
 from ..models.project import Project, TranslationUnit, Dependency, DependencyType, TranslationUnitType
 from ..models.config import DependencyConfig
 
+# #include directives, matched on raw bytes so sources are never decoded
+_INCLUDE_RE = re.compile(rb'#include\s*[<"]([^>"]+)[>"]')
+
+# Stop scanning a file after this many consecutive code lines without an #include
+_INCLUDE_SCAN_LIMIT = 200
+
+# C/C++ source and header extensions picked up by the directory walk
+_SOURCE_EXTENSIONS = {'.c', '.cpp', '.cc', '.cxx', '.c++', '.h', '.hpp', '.hxx', '.h++'}
+
+# Extensions that make a project C++ when querying the compiler's include path
+_CXX_EXTENSIONS = {'.cpp', '.cc', '.cxx', '.c++', '.hpp', '.hxx', '.h++'}
+
+# Directories never searched for sources
+_SKIP_DIRS = {'build', 'cmake-build', '.git', 'node_modules'}
+
+# Fallback system include paths, used when the compiler can't be queried
+_SYSTEM_INCLUDE_PATHS = (
+    Path("/usr/include"),
+    Path("/usr/local/include"),
+    Path("/usr/include/c++"),
+)
+
+# Exact, order-independent identity of a graph's nodes and edges
+GraphSignature = Tuple[FrozenSet[str], FrozenSet[Tuple[str, str]]]
+
 
 @dataclass
 class DependencyGraph:
@@ -21,15 +51,155 @@ class DependencyGraph:
     edges: Dict[str, Set[str]]
     in_degree: Dict[str, int]
     out_degree: Dict[str, int]
+    # Set by build_dependency_graph; hashable, so it keys caches directly
+    signature: Optional[GraphSignature] = field(default=None, compare=False)
+    _csr: Optional[Tuple[List[str], array, array]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_csr(self) -> Tuple[List[str], array, array]:
+        """Get a compressed sparse row view of the edges, built once
+        
+        Returns:
+            (id_node, indptr, indices): node i is id_node[i] and its
+            neighbors are the ids in indices[indptr[i]:indptr[i + 1]]
+        """
+        if self._csr is None:
+            id_node = list(self.nodes)
+            node_id = {node: i for i, node in enumerate(id_node)}
+            indptr = array('i', [0])
+            indices = array('i')
+            for node in id_node:
+                indices.extend(node_id[neighbor] for neighbor in self.edges[node])
+                indptr.append(len(indices))
+            self._csr = (id_node, indptr, indices)
+        return self._csr
+
+
+class DependencyCache:
+    """On-disk cache of the #include directives found in source files
+    
+    Entries are grouped by project root, so analyzing one project never
+    evicts another's. Each entry holds a source's mtime and size with its
+    raw includes and the files they resolved to; it is reused while the
+    stat matches and every include still resolves to the same file. A
+    project's entries are dropped when its include search path changes.
+    """
+    
+    # Bumped when the file layout changes; older caches are discarded
+    VERSION = 2
+    
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        # File entries of the project being analyzed, see open_project
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seen: Set[str] = set()
+        self._dirty = False
+        
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('version') == self.VERSION:
+                self.projects = data['projects']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable dependency cache {self.cache_file}: {e}")
+    
+    def open_project(self, project_root: Path, search_paths: List[str]) -> None:
+        """Select a project's entries, discarding them if its include search path changed"""
+        key = str(project_root)
+        project = self.projects.get(key)
+        if project is None or project['search_paths'] != search_paths:
+            project = {'search_paths': search_paths, 'files': {}}
+            self.projects[key] = project
+            self._dirty = True
+        self._entries = project['files']
+        self._seen = set()
+    
+    def get(
+        self, file_path: Path, mtime_ns: int, size: int,
+        resolve: Callable[[str], Optional[Path]]
+    ) -> Optional[List[Tuple[int, str, Optional[Path]]]]:
+        """Get a file's cached includes, or None if missing or stale
+        
+        Returns:
+            (line number, include, resolved file or None) for each include
+        """
+        key = str(file_path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if not entry or entry['mtime_ns'] != mtime_ns or entry['size'] != size:
+            return None
+        
+        includes = []
+        for line_number, include, target in entry['includes']:
+            # A header added, removed or shadowed since the entry was written
+            # changes what the include resolves to
+            resolved = resolve(include)
+            if (str(resolved) if resolved else None) != target:
+                return None
+            includes.append((line_number, include, resolved))
+        return includes
+    
+    def put(
+        self, file_path: Path, mtime_ns: int, size: int,
+        includes: List[Tuple[int, str, Optional[Path]]]
+    ) -> None:
+        """Store the includes found in a file with what they resolved to"""
+        key = str(file_path)
+        self._seen.add(key)
+        self._entries[key] = {
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'includes': [
+                [line_number, include, str(resolved) if resolved else None]
+                for line_number, include, resolved in includes
+            ]
+        }
+        self._dirty = True
+    
+    def flush(self) -> None:
+        """Write the cache, dropping the current project's files not seen in this run"""
+        stale = set(self._entries) - self._seen
+        if not self._dirty and not stale:
+            return
+        
+        for key in stale:
+            del self._entries[key]
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'version': self.VERSION, 'projects': self.projects}, f)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to write dependency cache {self.cache_file}: {e}")
 
 
 class DependencyAnalyzer:
     """Analyzes dependencies in C/C++ projects"""
     
-    def __init__(self, config: DependencyConfig):
+    def __init__(self, config: DependencyConfig, cache_dir: Optional[Path] = None):
         self.config = config
         self.clang_path = config.clang_path or "clang"
         self.compile_commands_path = config.compile_commands_path
+        # Dependencies from previous runs, reused for unchanged files
+        self.cache = DependencyCache(Path(cache_dir) / "dep_cache.json") if cache_dir else None
+        # Include resolutions: relative lookups keyed by (source dir, include),
+        # include-path/system lookups keyed by include alone
+        self._resolve_cache: Dict[Tuple[Path, str], Optional[Path]] = {}
+        self._search_path_cache: Dict[str, Optional[Path]] = {}
+        # Topological orders keyed by (graph signature, use_dfs)
+        self._topo_cache: Dict[Tuple[GraphSignature, bool], List[str]] = {}
+        # Toolchain include search paths, queried from the compiler once per
+        # language ('c' or 'c++'), and the one in use for the current project
+        self._queried_include_paths: Dict[str, Tuple[Path, ...]] = {}
+        self._system_include_paths: Optional[Tuple[Path, ...]] = None
+        # Root of the project being analyzed; includes resolving outside it
+        # (system and third-party headers) are not recorded as dependencies
+        self._project_root: Optional[str] = None
         
     async def analyze_project(self, project_path: Path) -> Project:
         """Analyze a C/C++ project and extract dependencies"""
@@ -42,8 +212,22 @@ class DependencyAnalyzer:
         # Create translation units
         units = await self._create_translation_units(source_files)
         
-        # Analyze dependencies
+        language = 'c++' if any(path.suffix.lower() in _CXX_EXTENSIONS for path, _ in source_files) else 'c'
+        if language not in self._queried_include_paths:
+            self._queried_include_paths[language] = await asyncio.to_thread(
+                self._query_system_include_paths, language
+            )
+        self._system_include_paths = self._queried_include_paths[language]
+        self._project_root = os.path.abspath(project_path)
+        
+        # Analyze dependencies; include resolutions are only trusted within one run
+        self._resolve_cache.clear()
+        self._search_path_cache.clear()
+        if self.cache:
+            self.cache.open_project(project_path, [str(path) for path in self._search_paths()])
         await self._analyze_dependencies(units)
+        if self.cache:
+            self.cache.flush()
         
         # Create project
         project = Project(
@@ -57,41 +241,76 @@ class DependencyAnalyzer:
         
         return project
     
-    async def _find_source_files(self, project_path: Path) -> List[Path]:
-        """Find all C/C++ source files in the project"""
-        source_extensions = {'.c', '.cpp', '.cc', '.cxx', '.c++', '.h', '.hpp', '.hxx', '.h++'}
+    async def _find_source_files(self, project_path: Path) -> List[Tuple[Path, Optional[os.stat_result]]]:
+        """Find all C/C++ source files in the project
+        
+        Returns:
+            Sorted list of (file path, stat) pairs; stat is None if it failed
+        """
+        # Walk each top-level directory in its own thread so directory reads
+        # overlap on large or network-mounted trees
+        source_files, subtrees = self._scan_directory(str(project_path))
+        walks = await asyncio.gather(*(asyncio.to_thread(self._walk_subtree, path) for path in subtrees))
+        for files in walks:
+            source_files.extend(files)
+        
+        return sorted(source_files, key=lambda item: item[0])
+    
+    def _walk_subtree(self, root: str) -> List[Tuple[Path, Optional[os.stat_result]]]:
+        """Collect the source files under a directory (blocking)"""
         source_files = []
-        
-        for root, dirs, files in os.walk(project_path):
-            # Skip build directories
-            dirs[:] = [d for d in dirs if d not in {'build', 'cmake-build', '.git', 'node_modules'}]
-            
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in source_extensions:
-                    source_files.append(file_path)
-        
-        return sorted(source_files)
+        stack = [root]
+        while stack:
+            files, subdirs = self._scan_directory(stack.pop())
+            source_files.extend(files)
+            stack.extend(subdirs)
+        return source_files
+    
+    @staticmethod
+    def _scan_directory(path: str) -> Tuple[List[Tuple[Path, Optional[os.stat_result]]], List[str]]:
+        """List one directory's source files and the subdirectories to descend into"""
+        files = []
+        subdirs = []
+        
+        # scandir entries carry their type and stat, so each file costs one
+        # directory read instead of a separate stat per file
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Skip build directories; symlinked dirs are not followed
+                    if not entry.is_symlink() and entry.name not in _SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in _SOURCE_EXTENSIONS:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        stat = None
+                    files.append((Path(entry.path), stat))
+        
+        return files, subdirs
     
-    async def _create_translation_units(self, source_files: List[Path]) -> List[TranslationUnit]:
-        """Create translation units from source files"""
+    async def _create_translation_units(
+        self, source_files: List[Tuple[Path, Optional[os.stat_result]]]
+    ) -> List[TranslationUnit]:
+        """Create translation units from (path, stat) pairs"""
         units = []
         header_files = set()
         
         # First pass: identify header files
-        for file_path in source_files:
+        for file_path, _ in source_files:
             if file_path.suffix.lower() in {'.h', '.hpp', '.hxx', '.h++'}:
                 header_files.add(file_path)
         
         # Second pass: create units
-        for file_path in source_files:
+        for file_path, stat in source_files:
             unit_type = self._determine_unit_type(file_path, header_files)
             
             unit = TranslationUnit(
                 name=file_path.name,
                 path=file_path,
                 type=unit_type,
-                size=file_path.stat().st_size if file_path.exists() else 0
+                size=stat.st_size if stat else 0,
+                mtime_ns=stat.st_mtime_ns if stat else None
             )
             
             units.append(unit)
@@ -118,84 +337,187 @@ class DependencyAnalyzer:
         """Analyze dependencies between translation units"""
         logger.info("Analyzing dependencies...")
         
-        for unit in units:
-            if unit.path.exists():
-                dependencies = await self._extract_dependencies(unit.path)
-                unit.dependencies = dependencies
-                
-                # Update dependents
-                for dep in dependencies:
-                    target_unit = self._find_unit_by_path(units, dep.target)
-                    if target_unit:
-                        target_unit.dependents.append(str(unit.path))
-    
-    async def _extract_dependencies(self, file_path: Path) -> List[Dependency]:
-        """Extract dependencies from a source file"""
-        dependencies = []
+        # Files are read and includes resolved in worker threads; the
+        # semaphore keeps the number of queued extractions bounded
+        semaphore = asyncio.Semaphore(min(64, (os.cpu_count() or 1) * 4))
         
-        try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+        async def extract(unit: TranslationUnit) -> List[Dependency]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._extract_dependencies, unit.path, unit.mtime_ns, unit.size
+                )
+        
+        # Units come from the directory walk, so their files are known to exist
+        results = await asyncio.gather(*(extract(unit) for unit in units))
+        
+        path_index = {str(unit.path): unit for unit in units}
+        for unit, dependencies in zip(units, results):
+            unit.dependencies = dependencies
             
-            # Extract #include statements
-            import re
-            include_pattern = r'#include\s*[<"]([^>"]+)[>"]'
-            matches = re.finditer(include_pattern, content)
+            # Update dependents
+            for dep in dependencies:
+                target_unit = path_index.get(dep.target)
+                if target_unit:
+                    target_unit.dependents.append(str(unit.path))
+    
+    def _extract_dependencies(
+        self, file_path: Path, mtime_ns: Optional[int] = None, size: int = 0
+    ) -> List[Dependency]:
+        """Extract dependencies from a source file (blocking, run via asyncio.to_thread)
+        
+        mtime_ns and size come from the directory walk; the file is only
+        stat'ed here when they are missing.
+        """
+        def resolve(include_path: str) -> Optional[Path]:
+            resolved = self._resolve_include_path(file_path, include_path)
+            return resolved if resolved and self._in_project(resolved) else None
+        
+        includes = None
+        if self.cache:
+            if mtime_ns is None:
+                try:
+                    stat = file_path.stat()
+                    mtime_ns, size = stat.st_mtime_ns, stat.st_size
+                except OSError:
+                    pass
+            if mtime_ns is not None:
+                includes = self.cache.get(file_path, mtime_ns, size, resolve)
+        
+        if includes is None:
+            try:
+                includes = [
+                    (line_number, include_path, resolve(include_path))
+                    for line_number, include_path in self._scan_includes(file_path)
+                ]
+            except Exception as e:
+                logger.warning(f"Failed to analyze dependencies for {file_path}: {e}")
+                return []
             
-            for match in matches:
-                include_path = match.group(1)
-                line_number = content[:match.start()].count('\n') + 1
+            if self.cache and mtime_ns is not None:
+                self.cache.put(file_path, mtime_ns, size, includes)
+        
+        source = str(file_path)
+        return [
+            # Interned: the same headers are included across many units
+            Dependency(
+                source=source,
+                target=sys.intern(str(resolved_path)),
+                type=DependencyType.INCLUDE,
+                line_number=line_number
+            )
+            for line_number, _, resolved_path in includes
+            if resolved_path
+        ]
+    
+    @staticmethod
+    def _scan_includes(file_path: Path) -> List[Tuple[int, str]]:
+        """Find the #include directives in a source file (blocking)
+        
+        Returns:
+            (line number, include path) pairs in file order
+        """
+        includes = []
+        # Stream the file line by line; includes sit near the top, so
+        # give up after a long run of code lines without one
+        code_lines = 0
+        in_comment = False
+        with open(file_path, 'rb') as f:
+            for line_number, line in enumerate(f, start=1):
+                # Extract #include statements
+                for match in _INCLUDE_RE.finditer(line):
+                    code_lines = 0
+                    includes.append((line_number, match.group(1).decode('utf-8', 'ignore')))
                 
-                # Resolve include path
-                resolved_path = await self._resolve_include_path(file_path, include_path)
-                if resolved_path:
-                    dep = Dependency(
-                        source=str(file_path),
-                        target=str(resolved_path),
-                        type=DependencyType.INCLUDE,
-                        line_number=line_number
-                    )
-                    dependencies.append(dep)
-        
-        except Exception as e:
-            logger.warning(f"Failed to analyze dependencies for {file_path}: {e}")
-        
-        return dependencies
+                # Blank lines, comments and preprocessor lines don't count as code
+                stripped = line.strip()
+                if in_comment:
+                    in_comment = b'*/' not in stripped
+                elif stripped.startswith(b'/*'):
+                    in_comment = b'*/' not in stripped
+                elif stripped and not stripped.startswith((b'//', b'#')):
+                    code_lines += 1
+                    if code_lines > _INCLUDE_SCAN_LIMIT:
+                        break
+        
+        return includes
     
-    async def _resolve_include_path(self, source_file: Path, include_path: str) -> Optional[Path]:
+    def _in_project(self, path: Path) -> bool:
+        """Whether a resolved include lies under the project being analyzed"""
+        if self._project_root is None:
+            return True
+        return os.path.abspath(path).startswith(os.path.join(self._project_root, ''))
+    
+    def _resolve_include_path(self, source_file: Path, include_path: str) -> Optional[Path]:
         """Resolve an include path to an actual file"""
+        key = (source_file.parent, include_path)
+        if key in self._resolve_cache:
+            return self._resolve_cache[key]
+        
         # Try relative to source file directory
         relative_path = source_file.parent / include_path
         if relative_path.exists():
-            return relative_path
+            resolved = relative_path
+        else:
+            resolved = self._resolve_from_search_paths(include_path)
         
-        # Try include paths from config
-        for include_dir in self.config.include_paths:
-            full_path = Path(include_dir) / include_path
-            if full_path.exists():
-                return full_path
+        self._resolve_cache[key] = resolved
+        return resolved
+    
+    def _resolve_from_search_paths(self, include_path: str) -> Optional[Path]:
+        """Resolve an include against the configured and system include paths"""
+        if include_path in self._search_path_cache:
+            return self._search_path_cache[include_path]
         
-        # Try system include paths
-        system_paths = [
-            Path("/usr/include"),
-            Path("/usr/local/include"),
-            Path("/usr/include/c++"),
-        ]
+        resolved = None
         
-        for system_path in system_paths:
-            full_path = system_path / include_path
+        # Try include paths from config, then system include paths
+        for include_dir in self._search_paths():
+            full_path = include_dir / include_path
             if full_path.exists():
-                return full_path
+                resolved = full_path
+                break
         
-        return None
+        self._search_path_cache[include_path] = resolved
+        return resolved
     
-    def _find_unit_by_path(self, units: List[TranslationUnit], path: str) -> Optional[TranslationUnit]:
-        """Find a translation unit by path"""
-        for unit in units:
-            if str(unit.path) == path:
-                return unit
-        return None
+    def _search_paths(self) -> Tuple[Path, ...]:
+        """Directories searched for includes not found next to the source, in order"""
+        system_paths = self._system_include_paths or _SYSTEM_INCLUDE_PATHS
+        return (*(Path(path) for path in self.config.include_paths), *system_paths)
+    
+    def _query_system_include_paths(self, language: str) -> Tuple[Path, ...]:
+        """Ask the compiler for its <...> include search path for a language (blocking)
+        
+        Falls back to the common system locations if the compiler is
+        missing or its output can't be parsed.
+        """
+        try:
+            proc = subprocess.run(
+                [self.clang_path, "-E", f"-x{language}", "-", "-v"],
+                input=b"",
+                capture_output=True,
+                timeout=30
+            )
+        except Exception as e:
+            logger.debug("Could not query system include paths from {}: {}", self.clang_path, e)
+            return _SYSTEM_INCLUDE_PATHS
+        
+        paths = []
+        in_search_list = False
+        for line in proc.stderr.decode('utf-8', errors='ignore').splitlines():
+            if line.startswith('#include <...> search starts here:'):
+                in_search_list = True
+            elif line.startswith('End of search list.'):
+                break
+            elif in_search_list:
+                # macOS lists framework directories with a suffix
+                paths.append(Path(line.strip().replace(' (framework directory)', '')))
+        
+        if not paths:
+            return _SYSTEM_INCLUDE_PATHS
+        
+        logger.debug("System include paths: {}", paths)
+        return tuple(paths)
     
     def build_dependency_graph(self, units: List[TranslationUnit]) -> DependencyGraph:
         """Build a dependency graph from translation units"""
@@ -213,69 +535,92 @@ class DependencyAnalyzer:
             out_degree[path] = 0
         
         # Add edges
+        edge_pairs = []
         for unit in units:
             source = str(unit.path)
             for dep in unit.dependencies:
                 target = dep.target
-                if target in nodes:
+                if target in nodes and target not in edges[source]:
                     edges[source].add(target)
                     in_degree[target] += 1
                     out_degree[source] += 1
+                    edge_pairs.append((source, target))
         
-        return DependencyGraph(nodes, edges, in_degree, out_degree)
+        signature = (frozenset(nodes), frozenset(edge_pairs))
+        return DependencyGraph(nodes, edges, in_degree, out_degree, signature)
     
     def topological_sort(self, graph: DependencyGraph, use_dfs: bool = True) -> List[str]:
-        """Perform topological sort on the dependency graph"""
+        """Perform topological sort on the dependency graph
+        
+        Orders for graphs with a known signature are cached, so sorting an
+        unchanged project again (resume, status) is a dict lookup.
+        """
+        cache_key = (graph.signature, use_dfs) if graph.signature is not None else None
+        if cache_key in self._topo_cache:
+            return list(self._topo_cache[cache_key])
+        
         if use_dfs:
-            return self._topological_sort_dfs(graph)
+            result = self._topological_sort_dfs(graph)
         else:
-            return self._topological_sort_bfs(graph)
+            result = self._topological_sort_bfs(graph)
+        
+        if cache_key is not None:
+            self._topo_cache[cache_key] = result
+            result = list(result)
+        return result
     
     def _topological_sort_dfs(self, graph: DependencyGraph) -> List[str]:
         """Topological sort using DFS"""
         visited = set()
         result = []
         
-        def dfs(node: str) -> None:
-            if node in visited:
-                return
-            visited.add(node)
+        # Iterative DFS with an explicit stack so deep include chains
+        # don't hit the recursion limit
+        for root in graph.nodes:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(graph.edges[root]))]
             
-            for neighbor in graph.edges[node]:
-                dfs(neighbor)
-            
-            result.append(node)
-        
-        for node in graph.nodes:
-            if node not in visited:
-                dfs(node)
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        stack.append((neighbor, iter(graph.edges[neighbor])))
+                        break
+                else:
+                    # All neighbors done; emit in post-order
+                    stack.pop()
+                    result.append(node)
         
         return result
     
     def _topological_sort_bfs(self, graph: DependencyGraph) -> List[str]:
         """Topological sort using BFS (Kahn's algorithm)"""
-        from collections import deque
-        
-        queue = deque()
-        result = []
-        in_degree_copy = graph.in_degree.copy()
+        # Work on integer node ids over the CSR arrays, so the main loop
+        # does no hashing
+        id_node, indptr, indices = graph.to_csr()
+        in_degree = array('i', [0]) * len(id_node)
+        for neighbor in indices:
+            in_degree[neighbor] += 1
         
         # Start with nodes that have no incoming edges
-        for node in graph.nodes:
-            if in_degree_copy[node] == 0:
-                queue.append(node)
+        queue = deque([i for i, degree in enumerate(in_degree) if not degree])
+        order = []
         
         while queue:
             current = queue.popleft()
-            result.append(current)
+            order.append(current)
             
             # Remove current node and update in-degrees
-            for neighbor in graph.edges[current]:
-                in_degree_copy[neighbor] -= 1
-                if in_degree_copy[neighbor] == 0:
+            for neighbor in indices[indptr[current]:indptr[current + 1]]:
+                degree = in_degree[neighbor] - 1
+                in_degree[neighbor] = degree
+                if not degree:
                     queue.append(neighbor)
         
-        return result
+        return [id_node[i] for i in order]
     
     def optimize_translation_order(self, units: List[TranslationUnit]) -> List[TranslationUnit]:
         """Optimize the order of translation units for parallel processing"""
@@ -3,15 +3,143 @@ State management system for CStarX v2.0
 """
 
 import json
+import os
+import sys
 import asyncio
-from typing import Dict, List, Optional, Any, Set
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Any, Set, Tuple, Union
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from loguru import logger
 
-from ..models.project import Project, TranslationUnit, TranslationSession, TranslationResult
+from ..models.project import (
+    Project, TranslationUnit, TranslationSession, TranslationResult,
+    Dependency, DependencyType, TranslationUnitType, TranslationStatus
+)
 from ..models.config import Config
+from ..utils.jsonio import dumps, loads
+
+# Fast setting: blobs are written once per distinct source file
+_BLOB_COMPRESSION_LEVEL = 3
+
+
+def _replace_bytes(file_path: Path, data: bytes) -> None:
+    """Atomically replace a file's contents (blocking, run via asyncio.to_thread)
+    
+    Readers see either the previous or the new contents, never a torn
+    write. The temporary name carries the pid so concurrent processes
+    sharing a state directory don't clobber each other's temp files.
+    """
+    tmp_file = file_path.with_name(f"{file_path.name}.tmp.{os.getpid()}")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, file_path)
+
+
+def _write_blobs(blob_dir: Path, blobs: Dict[str, str]) -> None:
+    """Write content-addressed blobs that aren't on disk yet (blocking)
+    
+    Blobs hold source text, which compresses well, so they are stored
+    zlib-compressed as <digest>.z.
+    """
+    if not blobs:
+        return
+    blob_dir.mkdir(exist_ok=True)
+    for digest, content in blobs.items():
+        blob_file = blob_dir / f"{digest}.z"
+        if not blob_file.exists():
+            _replace_bytes(blob_file, zlib.compress(content.encode('utf-8'), _BLOB_COMPRESSION_LEVEL))
+
+
+def _read_blob(blob_dir: Path, digest: str) -> str:
+    """Read a blob written by _write_blobs (blocking)"""
+    return zlib.decompress((blob_dir / f"{digest}.z").read_bytes()).decode('utf-8')
+
+
+def _append_bytes(file_path: Path, data: bytes) -> None:
+    """Append data to a file (blocking, run via asyncio.to_thread)"""
+    with open(file_path, 'ab') as f:
+        f.write(data)
+
+
+def _read_state_file(file_path: Path) -> Optional[Any]:
+    """Read and parse a state file, or None if it doesn't exist (blocking)"""
+    try:
+        return loads(file_path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def read_unit_deltas(delta_file: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the entries of a per-unit delta log in append order (blocking)
+    
+    Each entry holds a unit record plus the project counters at the time
+    it was written. Shared with the progress viewer so mid-run status
+    reflects units that haven't been compacted into the project file yet.
+    """
+    try:
+        f = open(delta_file, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except json.JSONDecodeError:
+                # A torn final line means the process died mid-append
+                logger.warning(f"Ignoring truncated entry in {delta_file.name}")
+                return
+
+
+class _ReadWriteLock:
+    """Asyncio readers-writer lock
+    
+    Readers share the lock; writers hold it exclusively and are preferred,
+    so a stream of loads can't starve a save.
+    """
+    
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+    
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[None]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[None]:
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+                # Wake readers held back by this writer if it was cancelled
+                self._cond.notify_all()
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._writing = False
+                self._cond.notify_all()
 
 
 @dataclass
@@ -30,6 +158,11 @@ class StateSnapshot:
 class StateManager:
     """Manages system state and persistence"""
     
+    # Fold a project's delta log back into its project file after this many entries
+    DELTA_COMPACT_THRESHOLD = 500
+    # Serialized unit records kept for reuse by later saves
+    UNIT_CACHE_SIZE = 10000
+    
     def __init__(self, config: Config):
         self.config = config
         self.state_dir = Path(config.output.output_dir) / "state"
@@ -37,21 +170,50 @@ class StateManager:
         
         self.current_project: Optional[Project] = None
         self.current_session: Optional[TranslationSession] = None
-        self.state_lock = asyncio.Lock()
+        # Loads share the lock, saves take it exclusively
+        self.state_lock = _ReadWriteLock()
+        # Entries in each project's delta log since its last full save
+        self._delta_counts: Dict[str, int] = {}
+        
+        # Source content never changes once loaded, so it is stored once under
+        # its sha256 and unit records only reference it
+        self.blob_dir = self.state_dir / "blobs"
+        self._blob_refs: Dict[str, Tuple[str, str]] = {}
+        self._stored_blobs: Set[str] = set()
+        self._pending_blobs: Dict[str, str] = {}
+        
+        # Unit ID -> (fingerprint, serialized record) for units unchanged since
+        # their last save
+        self._unit_cache: "OrderedDict[str, Tuple[Tuple, bytes]]" = OrderedDict()
+        
+        # Resolved source path -> IDs of the projects saved for it, oldest
+        # first; loaded from path_index.json on first use
+        self._path_index_file = self.state_dir / "path_index.json"
+        self._path_index: Optional[Dict[str, List[str]]] = None
+        self._indexed_ids: Set[str] = set()
         
         logger.info("State manager initialized")
     
     async def save_project(self, project: Project) -> None:
         """Save project state"""
-        async with self.state_lock:
-            project_file = self.state_dir / f"project_{project.id}.json"
-            
+        project_file = self.state_dir / f"project_{project.id}.json"
+        delta_file = self._delta_file(project.id)
+        
+        def write(data: bytes, blobs: Dict[str, str]) -> None:
+            _write_blobs(self.blob_dir, blobs)
+            _replace_bytes(project_file, data)
+            # The full save supersedes any per-unit deltas
+            delta_file.unlink(missing_ok=True)
+        
+        # The snapshot is taken under the lock: a delta appended between the
+        # snapshot and the unlink would otherwise be deleted without being
+        # folded into the project file. Encoding and I/O run off the event loop.
+        async with self.state_lock.writer():
             project_data = {
                 'id': project.id,
                 'name': project.name,
                 'path': str(project.path),
                 'target_language': project.target_language,
-                'units': [self._unit_to_dict(unit) for unit in project.units],
                 'created_at': project.created_at.isoformat(),
                 'updated_at': project.updated_at.isoformat(),
                 'total_files': project.total_files,
@@ -59,24 +221,171 @@ class StateManager:
                 'failed_files': project.failed_files,
                 'config': project.config
             }
+            # Unit records are spliced in pre-serialized, so unchanged units cost
+            # a cache lookup instead of a dict build and encode. Changed units are
+            # snapshotted to dicts here and encoded in a worker thread.
+            records = [(unit.id, self._unit_record(unit)) for unit in project.units]
+            
+            def encode() -> Tuple[bytes, Dict[str, Tuple[Tuple, bytes]]]:
+                chunks = []
+                encoded = {}
+                for unit_id, record in records:
+                    if not isinstance(record, bytes):
+                        fingerprint, unit_data = record
+                        record = dumps(unit_data)
+                        encoded[unit_id] = (fingerprint, record)
+                    chunks.append(record)
+                return dumps(project_data)[:-1] + b',"units":[' + b','.join(chunks) + b']}', encoded
+            
+            data, encoded = await asyncio.to_thread(encode)
+            for unit_id, (fingerprint, unit_bytes) in encoded.items():
+                self._cache_unit_bytes(unit_id, fingerprint, unit_bytes)
             
-            with open(project_file, 'w') as f:
-                json.dump(project_data, f, indent=2)
+            await self._write_with_blobs(write, data)
+            self._delta_counts[project.id] = 0
+            await self._index_project(project)
             
             self.current_project = project
             logger.info(f"Project saved: {project.id}")
     
+    async def find_project_ids(self, project_path: Path) -> List[str]:
+        """Get the IDs of projects saved for a source path, oldest first"""
+        index = await self._get_path_index()
+        return list(index.get(str(Path(project_path).resolve()), []))
+    
+    async def remove_projects(self, project_ids: List[str]) -> None:
+        """Delete projects' state files and drop them from the path index
+        
+        All files are removed in one worker-thread pass with a single
+        rewrite of the index.
+        """
+        if not project_ids:
+            return
+        
+        async with self.state_lock.writer():
+            await self._remove_projects_locked(set(project_ids))
+    
+    async def _remove_projects_locked(self, removed: Set[str]) -> None:
+        """Body of remove_projects; call with the writer lock held"""
+        index = await self._get_path_index()
+        for path_key, indexed_ids in list(index.items()):
+            indexed_ids[:] = [pid for pid in indexed_ids if pid not in removed]
+            if not indexed_ids:
+                del index[path_key]
+        index_data = dumps(index)
+        
+        def remove() -> None:
+            for project_id in removed:
+                (self.state_dir / f"project_{project_id}.json").unlink(missing_ok=True)
+                self._delta_file(project_id).unlink(missing_ok=True)
+            _replace_bytes(self._path_index_file, index_data)
+        
+        await asyncio.to_thread(remove)
+        for project_id in removed:
+            self._indexed_ids.discard(project_id)
+            self._delta_counts.pop(project_id, None)
+        await self._remove_unreferenced_blobs()
+    
+    async def _get_path_index(self) -> Dict[str, List[str]]:
+        """Get the path index, loading or rebuilding it on first use"""
+        if self._path_index is None:
+            index = await asyncio.to_thread(self._read_path_index)
+            if self._path_index is None:
+                self._path_index = index
+        return self._path_index
+    
+    def _read_path_index(self) -> Dict[str, List[str]]:
+        """Read the path index, rebuilding it from the project files if missing (blocking)"""
+        try:
+            index = _read_state_file(self._path_index_file)
+            if index is not None:
+                return index
+        except ValueError as e:
+            logger.warning(f"Rebuilding unreadable path index: {e}")
+        
+        # One-time scan of the project files, oldest first
+        project_files = []
+        with os.scandir(self.state_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("project_") and entry.name.endswith(".json"):
+                    try:
+                        project_files.append((entry.stat().st_mtime_ns, entry.path))
+                    except FileNotFoundError:
+                        continue
+        project_files.sort()
+        
+        index = {}
+        for _, project_file in project_files:
+            try:
+                project_data = _read_state_file(Path(project_file))
+                path_key = str(Path(project_data.get('path', '')).resolve())
+                index.setdefault(path_key, []).append(project_data['id'])
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                logger.debug(f"Skipping project file {project_file} in path index: {e}")
+        
+        _replace_bytes(self._path_index_file, dumps(index))
+        return index
+    
+    async def _index_project(self, project: Project) -> None:
+        """Add a project to the path index; call with the writer lock held"""
+        if project.id in self._indexed_ids:
+            return
+        
+        index = await self._get_path_index()
+        project_ids = index.setdefault(str(Path(project.path).resolve()), [])
+        if project.id not in project_ids:
+            project_ids.append(project.id)
+            await asyncio.to_thread(_replace_bytes, self._path_index_file, dumps(index))
+        self._indexed_ids.add(project.id)
+    
+    async def save_unit(self, project: Project, unit: TranslationUnit) -> None:
+        """Append a single unit update to the project's delta log
+        
+        Only the changed unit is serialized, so per-unit progress costs O(1)
+        instead of rewriting the whole project. The log is replayed by
+        load_project and folded into the project file by save_project.
+        """
+        await self.save_units(project, [unit])
+    
+    async def save_units(self, project: Project, units: List[TranslationUnit]) -> None:
+        """Append updates for several units to the delta log in one write"""
+        if not units:
+            return
+        
+        def write(lines: List[bytes], blobs: Dict[str, str]) -> None:
+            _write_blobs(self.blob_dir, blobs)
+            _append_bytes(self._delta_file(project.id), b''.join(lines))
+        
+        async with self.state_lock.writer():
+            # Serialized under the lock, like save_project's snapshot, so an
+            # entry never lands after a newer full save
+            delta_tail = dumps({
+                'translated_files': project.translated_files,
+                'failed_files': project.failed_files,
+                'updated_at': project.updated_at.isoformat()
+            })[1:]
+            lines = [b'{"unit":' + self._unit_bytes(unit) + b',' + delta_tail + b'\n' for unit in units]
+            
+            await self._write_with_blobs(write, lines)
+            delta_count = self._delta_counts.get(project.id, 0) + len(units)
+            self._delta_counts[project.id] = delta_count
+            
+            self.current_project = project
+            logger.debug(f"Units saved: {len(units)} ({project.id})")
+        
+        # Keep the log, and the replay on load, bounded
+        if delta_count >= self.DELTA_COMPACT_THRESHOLD:
+            await self.save_project(project)
+    
     async def load_project(self, project_id: str) -> Optional[Project]:
         """Load project state"""
-        async with self.state_lock:
+        async with self.state_lock.reader():
             project_file = self.state_dir / f"project_{project_id}.json"
             
-            if not project_file.exists():
+            project_data = await asyncio.to_thread(_read_state_file, project_file)
+            if project_data is None:
                 return None
             
-            with open(project_file, 'r') as f:
-                project_data = json.load(f)
-            
             # Reconstruct project
             project = Project(
                 id=project_data['id'],
@@ -98,56 +407,82 @@ class StateManager:
                 units.append(unit)
             
             project.units = units
+            self._delta_counts[project.id] = await asyncio.to_thread(self._replay_unit_deltas, project)
             self.current_project = project
             
             logger.info(f"Project loaded: {project.id}")
             return project
     
+    def _delta_file(self, project_id: str) -> Path:
+        """Path of the per-unit delta log for a project"""
+        return self.state_dir / f"project_{project_id}.delta.jsonl"
+    
+    def _replay_unit_deltas(self, project: Project) -> int:
+        """Apply logged unit updates on top of a loaded project
+        
+        Returns:
+            Number of delta entries applied
+        """
+        applied = 0
+        unit_index = {unit.id: i for i, unit in enumerate(project.units)}
+        for delta in read_unit_deltas(self._delta_file(project.id)):
+            unit = self._dict_to_unit(delta['unit'])
+            if unit.id in unit_index:
+                project.units[unit_index[unit.id]] = unit
+            else:
+                unit_index[unit.id] = len(project.units)
+                project.units.append(unit)
+            
+            project.translated_files = delta['translated_files']
+            project.failed_files = delta['failed_files']
+            project.updated_at = datetime.fromisoformat(delta['updated_at'])
+            applied += 1
+        
+        return applied
+    
     async def save_session(self, session: TranslationSession) -> None:
         """Save session state"""
-        async with self.state_lock:
-            session_file = self.state_dir / f"session_{session.id}.json"
-            
-            session_data = {
-                'id': session.id,
-                'project_id': session.project_id,
-                'started_at': session.started_at.isoformat(),
-                'completed_at': session.completed_at.isoformat() if session.completed_at else None,
-                'current_unit': session.current_unit,
-                'completed_units': list(session.completed_units),
-                'failed_units': list(session.failed_units),
-                'total_units': session.total_units,
-                'completed_count': session.completed_count,
-                'failed_count': session.failed_count,
-                'results': [self._result_to_dict(result) for result in session.results]
-            }
-            
-            with open(session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+        session_file = self.state_dir / f"session_{session.id}.json"
+        
+        session_data = {
+            'id': session.id,
+            'project_id': session.project_id,
+            'started_at': session.started_at.isoformat(),
+            'completed_at': session.completed_at.isoformat() if session.completed_at else None,
+            'current_unit': session.current_unit,
+            'completed_units': sorted(session.completed_units),
+            'failed_units': sorted(session.failed_units),
+            'total_units': session.total_units,
+            'completed_count': session.completed_count,
+            'failed_count': session.failed_count,
+            'results': [self._result_to_dict(result) for result in session.results]
+        }
+        data = dumps(session_data)
+        
+        async with self.state_lock.writer():
+            await asyncio.to_thread(_replace_bytes, session_file, data)
             
             self.current_session = session
-            logger.info(f"Session saved: {session.id}")
+            logger.debug("Session saved: {}", session.id)
     
     async def load_session(self, session_id: str) -> Optional[TranslationSession]:
         """Load session state"""
-        async with self.state_lock:
+        async with self.state_lock.reader():
             session_file = self.state_dir / f"session_{session_id}.json"
             
-            if not session_file.exists():
+            session_data = await asyncio.to_thread(_read_state_file, session_file)
+            if session_data is None:
                 return None
             
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
-            
-            # Reconstruct session
+            # Reconstruct session; the model builds the ID sets from the lists directly
             session = TranslationSession(
                 id=session_data['id'],
                 project_id=session_data['project_id'],
                 started_at=datetime.fromisoformat(session_data['started_at']),
                 completed_at=datetime.fromisoformat(session_data['completed_at']) if session_data['completed_at'] else None,
                 current_unit=session_data['current_unit'],
-                completed_units=set(session_data['completed_units']),
-                failed_units=set(session_data['failed_units']),
+                completed_units=session_data['completed_units'],
+                failed_units=session_data['failed_units'],
                 total_units=session_data['total_units'],
                 completed_count=session_data['completed_count'],
                 failed_count=session_data['failed_count']
@@ -186,18 +521,63 @@ class StateManager:
         )
         
         # Save snapshot
-        snapshot_file = self.state_dir / f"snapshot_{snapshot.timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        with open(snapshot_file, 'w') as f:
-            json.dump(asdict(snapshot), f, indent=2, default=str)
+        # Named by epoch milliseconds, which also keeps snapshots taken within
+        # the same second apart
+        snapshot_file = self.state_dir / f"snapshot_{int(snapshot.timestamp.timestamp() * 1000)}.json"
+        await asyncio.to_thread(_replace_bytes, snapshot_file, dumps(self._snapshot_to_dict(snapshot)))
         
         logger.info(f"Snapshot created: {snapshot_file}")
         return snapshot
     
+    async def find_latest_snapshot(self) -> Optional[Path]:
+        """Get the most recently written snapshot file, if any"""
+        def snapshot_time(entry: os.DirEntry) -> int:
+            # Snapshot names carry their creation time in milliseconds; fall
+            # back to the file's mtime for anything else
+            stem = entry.name[len("snapshot_"):-len(".json")]
+            if stem.isdigit():
+                return int(stem) * 1_000_000
+            try:
+                return entry.stat().st_mtime_ns
+            except FileNotFoundError:
+                return -1
+        
+        def find() -> Optional[Path]:
+            with os.scandir(self.state_dir) as entries:
+                latest = max(
+                    (entry for entry in entries
+                     if entry.name.startswith("snapshot_") and entry.name.endswith(".json")),
+                    key=snapshot_time,
+                    default=None
+                )
+            return Path(latest.path) if latest is not None else None
+        
+        return await asyncio.to_thread(find)
+    
+    async def load_snapshot(self, snapshot_file: Path) -> Optional[StateSnapshot]:
+        """Load a snapshot written by create_snapshot"""
+        snapshot_data = await asyncio.to_thread(_read_state_file, Path(snapshot_file))
+        if snapshot_data is None:
+            return None
+        
+        return StateSnapshot(
+            timestamp=datetime.fromisoformat(snapshot_data['timestamp']),
+            project_id=snapshot_data['project_id'],
+            session_id=snapshot_data['session_id'],
+            completed_units=set(snapshot_data['completed_units']),
+            failed_units=set(snapshot_data['failed_units']),
+            current_unit=snapshot_data['current_unit'],
+            progress=snapshot_data['progress'],
+            metadata=snapshot_data['metadata']
+        )
+    
     async def restore_snapshot(self, snapshot: StateSnapshot) -> None:
         """Restore from a state snapshot"""
-        # Load project and session
-        project = await self.load_project(snapshot.project_id)
-        session = await self.load_session(snapshot.session_id)
+        # Load project and session; both only take the shared side of the lock
+        project, session = await asyncio.gather(
+            self.load_project(snapshot.project_id),
+            self.load_session(snapshot.session_id)
+        )
         
         if not project or not session:
             raise ValueError("Failed to load project or session from snapshot")
@@ -211,24 +591,83 @@ class StateManager:
         session.completed_count = len(session.completed_units)
         session.failed_count = len(session.failed_units)
         
-        # Save restored state
-        await self.save_project(project)
+        # Only the session changed; load_project already made the project current
         await self.save_session(session)
         
         logger.info(f"State restored from snapshot: {snapshot.timestamp}")
     
+    def _snapshot_to_dict(self, snapshot: StateSnapshot) -> Dict[str, Any]:
+        """Convert StateSnapshot to dictionary
+        
+        Built field by field rather than with asdict(), which would deep-copy
+        the unit ID sets a second time.
+        """
+        return {
+            'timestamp': snapshot.timestamp.isoformat(),
+            'project_id': snapshot.project_id,
+            'session_id': snapshot.session_id,
+            'completed_units': sorted(snapshot.completed_units),
+            'failed_units': sorted(snapshot.failed_units),
+            'current_unit': snapshot.current_unit,
+            'progress': snapshot.progress,
+            'metadata': snapshot.metadata
+        }
+    
+    def _unit_bytes(self, unit: TranslationUnit) -> bytes:
+        """Serialize a unit record, reusing the last encoding if the unit is unchanged"""
+        record = self._unit_record(unit)
+        if isinstance(record, bytes):
+            return record
+        
+        fingerprint, unit_data = record
+        data = dumps(unit_data)
+        self._cache_unit_bytes(unit.id, fingerprint, data)
+        return data
+    
+    def _unit_record(self, unit: TranslationUnit) -> Union[bytes, Tuple[Tuple, Dict[str, Any]]]:
+        """Get a unit's cached encoding, or its fingerprint and dict if it changed
+        
+        Units are mutated in place without touching updated_at, so the
+        fingerprint covers every serialized field. Tuple comparison checks
+        identity first, so unchanged content strings compare in O(1); the
+        lists are only ever appended to, so their lengths are recorded too.
+        """
+        fingerprint = (
+            unit.status, unit.name, unit.path, unit.type, unit.size,
+            unit.complexity_score, unit.updated_at, unit.translation_time,
+            unit.error_message, unit.quality_score,
+            unit.original_content, unit.translated_content,
+            unit.dependencies, len(unit.dependencies),
+            unit.dependents, len(unit.dependents)
+        )
+        cached = self._unit_cache.get(unit.id)
+        if cached and cached[0] == fingerprint:
+            self._unit_cache.move_to_end(unit.id)
+            return cached[1]
+        
+        return fingerprint, self._unit_to_dict(unit)
+    
+    def _cache_unit_bytes(self, unit_id: str, fingerprint: Tuple, data: bytes) -> None:
+        """Remember a unit's encoding for reuse while its fingerprint holds"""
+        self._unit_cache[unit_id] = (fingerprint, data)
+        self._unit_cache.move_to_end(unit_id)
+        if len(self._unit_cache) > self.UNIT_CACHE_SIZE:
+            self._unit_cache.popitem(last=False)
+    
     def _unit_to_dict(self, unit: TranslationUnit) -> Dict[str, Any]:
         """Convert TranslationUnit to dictionary"""
+        unit_path = str(unit.path)
         return {
             'id': unit.id,
             'name': unit.name,
-            'path': str(unit.path),
+            'path': unit_path,
             'type': unit.type.value,
             'status': unit.status.value,
-            'original_content': unit.original_content,
+            'original_content_ref': self._content_ref(unit) if unit.original_content else None,
             'translated_content': unit.translated_content,
-            'dependencies': [self._dependency_to_dict(dep) for dep in unit.dependencies],
-            'dependents': unit.dependents,
+            'dependencies': [self._dependency_to_dict(dep, unit_path) for dep in unit.dependencies],
+            # Copied: the dict may be encoded off the event loop while the unit changes
+            'dependents': list(unit.dependents),
             'size': unit.size,
             'complexity_score': unit.complexity_score,
             'created_at': unit.created_at.isoformat(),
@@ -238,29 +677,79 @@ class StateManager:
             'quality_score': unit.quality_score
         }
     
+    def _content_ref(self, unit: TranslationUnit) -> str:
+        """Get the blob digest of a unit's source content, queueing new blobs for writing"""
+        content = unit.original_content
+        cached = self._blob_refs.get(unit.id)
+        if cached and cached[0] is content:
+            return cached[1]
+        
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self._blob_refs[unit.id] = (content, digest)
+        if digest not in self._stored_blobs:
+            self._pending_blobs[digest] = content
+        return digest
+    
+    async def _write_with_blobs(self, write: Callable[..., None], *args: Any) -> None:
+        """Run a blocking state write, passing it the blobs queued by _content_ref
+        
+        The blobs count as stored only once the write returns. If it fails
+        they are queued again, so the next save retries them rather than
+        referencing blobs that were never written.
+        """
+        blobs, self._pending_blobs = self._pending_blobs, {}
+        try:
+            await asyncio.to_thread(write, *args, blobs)
+        except BaseException:
+            for digest, content in blobs.items():
+                self._pending_blobs.setdefault(digest, content)
+            raise
+        self._stored_blobs.update(blobs)
+    
+    def _resolve_content_ref(self, data: Dict[str, Any]) -> Optional[str]:
+        """Read a unit's source content back from the blob store"""
+        digest = data.get('original_content_ref')
+        if not digest:
+            # State written before the blob store kept content inline
+            return data.get('original_content')
+        
+        try:
+            content = _read_blob(self.blob_dir, digest)
+        except (OSError, zlib.error):
+            # The orchestrator re-reads the source file when content is missing
+            logger.warning(f"Missing content blob {digest}")
+            return None
+        self._stored_blobs.add(digest)
+        return content
+    
     def _dict_to_unit(self, data: Dict[str, Any]) -> TranslationUnit:
-        """Convert dictionary to TranslationUnit"""
-        from ..models.project import Dependency, DependencyType, TranslationUnitType, TranslationStatus
-        
-        # Reconstruct dependencies
-        dependencies = []
-        for dep_data in data['dependencies']:
-            dep = Dependency(
-                source=dep_data['source'],
-                target=dep_data['target'],
+        """Convert dictionary to TranslationUnit
+        
+        State files are written by this class, so the models are built with
+        model_construct and skip pydantic validation; every field is already
+        converted to its model type here.
+        """
+        # Reconstruct dependencies; targets repeat across units, so they are
+        # interned to share one string per header
+        unit_path = data['path']
+        dependencies = [
+            Dependency.model_construct(
+                source=dep_data.get('source', unit_path),
+                target=sys.intern(dep_data['target']),
                 type=DependencyType(dep_data['type']),
                 line_number=dep_data.get('line_number'),
                 context=dep_data.get('context')
             )
-            dependencies.append(dep)
+            for dep_data in data['dependencies']
+        ]
         
-        unit = TranslationUnit(
+        unit = TranslationUnit.model_construct(
             id=data['id'],
             name=data['name'],
-            path=Path(data['path']),
+            path=Path(unit_path),
             type=TranslationUnitType(data['type']),
             status=TranslationStatus(data['status']),
-            original_content=data.get('original_content'),
+            original_content=self._resolve_content_ref(data),
             translated_content=data.get('translated_content'),
             dependencies=dependencies,
             dependents=data['dependents'],
@@ -275,15 +764,22 @@ class StateManager:
         
         return unit
     
-    def _dependency_to_dict(self, dep: 'Dependency') -> Dict[str, Any]:
-        """Convert Dependency to dictionary"""
-        return {
-            'source': dep.source,
+    def _dependency_to_dict(self, dep: Dependency, unit_path: str) -> Dict[str, Any]:
+        """Convert Dependency to dictionary
+        
+        The source is left out when it is the owning unit's path (the usual
+        case) and context when it is unset; _dict_to_unit fills both back in.
+        """
+        dep_data = {
             'target': dep.target,
             'type': dep.type.value,
-            'line_number': dep.line_number,
-            'context': dep.context
+            'line_number': dep.line_number
         }
+        if dep.source != unit_path:
+            dep_data['source'] = dep.source
+        if dep.context is not None:
+            dep_data['context'] = dep.context
+        return dep_data
     
     def _result_to_dict(self, result: TranslationResult) -> Dict[str, Any]:
         """Convert TranslationResult to dictionary"""
@@ -312,12 +808,105 @@ class StateManager:
     
     async def cleanup_old_states(self, days: int = 7) -> None:
         """Clean up old state files"""
-        cutoff_time = datetime.now().timestamp() - (days * 24 * 60 * 60)
+        cutoff_time = time.time() - (days * 24 * 60 * 60)
+        
+        async with self.state_lock.writer():
+            removed = await asyncio.to_thread(self._remove_state_files_before, cutoff_time)
+            if not removed:
+                return
+            logger.info(f"Cleaned up {len(removed)} old state files: {', '.join(removed)}")
+            
+            # Drop deleted projects from the path index, along with any delta
+            # log that outlived its project file
+            removed_ids = {
+                name[len("project_"):-len(".json")]
+                for name in removed
+                if name.startswith("project_") and name.endswith(".json")
+            }
+            if removed_ids:
+                await self._remove_projects_locked(removed_ids)
+            else:
+                await self._remove_unreferenced_blobs()
+    
+    def _remove_state_files_before(self, cutoff_time: float) -> List[str]:
+        """Delete state files last modified before cutoff_time (blocking)
+        
+        One directory pass covers both file patterns. The path index is
+        kept; cleanup_old_states updates it instead.
+        """
+        removed = []
+        with os.scandir(self.state_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(('.json', '.jsonl')) or not entry.is_file():
+                    continue
+                if entry.name == self._path_index_file.name:
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff_time:
+                        os.unlink(entry.path)
+                        removed.append(entry.name)
+                except OSError as e:
+                    logger.warning(f"Failed to clean up state file {entry.path}: {e}")
+        return removed
+    
+    async def _remove_unreferenced_blobs(self) -> None:
+        """Delete content blobs no remaining project references
+        
+        Must be called with the writer lock held, so no save can reference
+        a blob between the scan and the unlink.
+        """
+        removed = await asyncio.to_thread(self._collect_blobs)
+        if not removed:
+            return
+        
+        # Forget them, and the cached unit encodings that reference them, so
+        # the next save writes a blob again if an in-memory unit still needs it
+        self._stored_blobs.difference_update(removed)
+        stale_ids = [unit_id for unit_id, ref in self._blob_refs.items() if ref[1] in removed]
+        for unit_id in stale_ids:
+            del self._blob_refs[unit_id]
+            self._unit_cache.pop(unit_id, None)
+        logger.debug("Removed {} unreferenced content blobs", len(removed))
+    
+    def _collect_blobs(self) -> Set[str]:
+        """Unlink blobs not referenced by any project file or delta log (blocking)
+        
+        Returns:
+            Digests of the removed blobs
+        """
+        if not self.blob_dir.exists():
+            return set()
+        
+        referenced = set()
+        with os.scandir(self.state_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith('project_'):
+                    continue
+                try:
+                    if entry.name.endswith('.delta.jsonl'):
+                        units = [delta['unit'] for delta in read_unit_deltas(Path(entry.path))]
+                    elif entry.name.endswith('.json'):
+                        units = (_read_state_file(Path(entry.path)) or {}).get('units', [])
+                    else:
+                        continue
+                except (OSError, ValueError, KeyError, AttributeError) as e:
+                    # Without every reference known, no blob is safe to delete
+                    logger.warning(f"Skipping blob cleanup, unreadable state file {entry.name}: {e}")
+                    return set()
+                referenced.update(unit['original_content_ref'] for unit in units if unit.get('original_content_ref'))
         
-        for state_file in self.state_dir.glob("*.json"):
-            if state_file.stat().st_mtime < cutoff_time:
-                state_file.unlink()
-                logger.info(f"Cleaned up old state file: {state_file}")
+        removed = set()
+        with os.scandir(self.blob_dir) as entries:
+            for entry in entries:
+                digest = entry.name[:-len('.z')]
+                if not entry.name.endswith('.z') or digest in referenced:
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    removed.add(digest)
+                except OSError as e:
+                    logger.warning(f"Failed to remove blob {entry.path}: {e}")
+        return removed
     
     async def get_state_summary(self) -> Dict[str, Any]:
         """Get a summary of current state"""
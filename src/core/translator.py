@@ -3,8 +3,9 @@ Main translator class for CStarX v2.0
 """
 
 import asyncio
-import json
-from typing import Optional, Dict, Any
+import os
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 from loguru import logger
 
@@ -14,6 +15,24 @@ from .dependency_analyzer import DependencyAnalyzer
 from .state_manager import StateManager
 from ..agents.orchestrator import AgentOrchestrator
 from ..mcp import MCPClient, MCPTranslator
+from ..utils.cargo import cargo_toml_content
+
+# Upper bound on output files being written at once
+_OUTPUT_WRITE_CONCURRENCY = 32
+
+_GITIGNORE_CONTENT = "/target/\nCargo.lock\n"
+
+
+def _make_dirs(directories: List[Path]) -> None:
+    """Create output directories, each once (blocking)"""
+    # Sorted so a parent in the set is created before its children
+    for directory in sorted(set(directories)):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def _write_unit(rust_file_path: Path, content: str) -> None:
+    """Write one generated Rust file into an existing directory (blocking)"""
+    rust_file_path.write_text(content, encoding='utf-8')
 
 
 class Translator:
@@ -21,7 +40,7 @@ class Translator:
     
     def __init__(self, config: Optional[Config] = None):
         self.config = config or Config()
-        self.dependency_analyzer = DependencyAnalyzer(self.config.dependency)
+        self.dependency_analyzer = DependencyAnalyzer(self.config.dependency, Path(self.config.output.output_dir) / "state")
         self.state_manager = StateManager(self.config)
         self.mcp_client = MCPClient(self.config)
         self.mcp_translator = MCPTranslator(self.mcp_client, self.config)
@@ -39,95 +58,92 @@ class Translator:
         
         # Check if project already exists in state
         project_path_obj = Path(project_path).resolve()
-        existing_project = await self._find_existing_project(project_path_obj)
+        existing_project, duplicate_ids = await self._scan_project_states(project_path_obj)
         
         if existing_project:
             logger.info(f"Found existing project: {existing_project.id}")
             project = existing_project
             # Clean up duplicate state files for this project path
-            await self._cleanup_duplicate_states(project.id, project_path_obj)
+            await self._remove_duplicate_states(duplicate_ids)
         else:
             # Analyze project
             project = await self.dependency_analyzer.analyze_project(project_path_obj)
             await self.state_manager.save_project(project)
         
-        # Translate using orchestrator with MCP and state manager
-        translated_project = await self.orchestrator.translate_project(
-            project_path,
-            mcp_client=self.mcp_client,
-            mcp_translator=self.mcp_translator,
-            state_manager=self.state_manager
-        )
-        
-        # Save final state
-        await self.state_manager.save_project(translated_project)
-        
-        # Always generate output files to final directory
-        await self._generate_output_files(translated_project, use_final_dir=True)
-        
-            # Verify modules compilation in final directory
-        final_project_dir = Path(self.config.output.output_dir) / f"{translated_project.name}-final"
-        if final_project_dir.exists():
-            await self._verify_modules_compilation(translated_project, final_project_dir)
+        # Translate using orchestrator with MCP and state manager; the
+        # orchestrator saves the final project state itself
+        try:
+            translated_project = await self.orchestrator.translate_project(
+                project_path,
+                mcp_client=self.mcp_client,
+                mcp_translator=self.mcp_translator,
+                state_manager=self.state_manager
+            )
+        finally:
+            # Translation is the only LLM user; release its connection pool
+            await self.mcp_client.close()
+        
+        # Always generate output files to final directory, which creates it
+        final_project_dir = self._project_output_dir(translated_project, use_final_dir=True)
+        await self._generate_output_files(translated_project, final_project_dir)
+        
+        # Verify modules compilation in final directory
+        await self._verify_modules_compilation(translated_project, final_project_dir)
         
         # Verify project compilation in final directory (optional, can be disabled)
-        if final_project_dir.exists():
-            await self._verify_project_compilation(translated_project, final_project_dir)
+        await self._verify_project_compilation(translated_project, final_project_dir)
         
         logger.info("Translation complete")
         return translated_project
     
-    async def _find_existing_project(self, project_path: Path) -> Optional[Project]:
-        """Find existing project in state by path"""
-        # Try to find project by matching path
-        state_dir = self.state_manager.state_dir
-        project_files = list(state_dir.glob("project_*.json"))
+    async def _scan_project_states(self, project_path: Path) -> Tuple[Optional[Project], List[str]]:
+        """Find the existing project for a path and the IDs of its duplicates
         
-        for project_file in project_files:
+        Looks the path up in the state manager's index once; the most recently
+        indexed project that still loads is kept and every other ID saved for
+        the same path is reported as a duplicate.
+        """
+        project_ids = await self.state_manager.find_project_ids(project_path)
+        
+        for project_id in reversed(project_ids):
             try:
-                with open(project_file, 'r') as f:
-                    project_data = json.load(f)
-                    # Match by normalized path
-                    stored_path = Path(project_data.get('path', '')).resolve()
-                    current_path = project_path.resolve()
-                    if stored_path == current_path:
-                        # Found matching project, load it
-                        project_id = project_data.get('id')
-                        if project_id:
-                            project = await self.state_manager.load_project(project_id)
-                            if project:
-                                logger.info(f"Found existing project by path: {project.id}")
-                                return project
+                project = await self.state_manager.load_project(project_id)
             except Exception as e:
-                logger.debug(f"Error checking project file {project_file}: {e}")
+                logger.debug(f"Error loading project {project_id}: {e}")
                 continue
+            if project:
+                logger.info(f"Found existing project by path: {project.id}")
+                return project, [pid for pid in project_ids if pid != project.id]
         
-        return None
+        return None, []
     
-    async def _generate_output_files(self, project: Project, use_final_dir: bool = False) -> None:
-        """Generate output Rust files
+    def _project_output_dir(self, project: Project, use_final_dir: bool = False) -> Path:
+        """Get the directory a project's Rust output is written to
         
         Args:
-            project: Project to generate files for
-            use_final_dir: If True, create a new 'final' directory for final output
+            project: Project to get the directory for
+            use_final_dir: If True, use the 'final' directory for final output
                           (e.g., output/{project-name}-final/), otherwise use regular directory
         """
-        output_dir = self.config.output.output_dir
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Determine output directory name
+        output_dir = Path(self.config.output.output_dir)
         if use_final_dir:
             # Final output goes to a separate directory (e.g., output/01-Primary-final/)
-            project_output_dir = output_dir / f"{project.name}-final"
-            logger.info(f"Generating final output files in: {project_output_dir}")
-        else:
-            # Regular output directory (for real-time generation)
-            project_output_dir = output_dir / project.name
-            logger.info(f"Generating output files in: {project_output_dir}")
+            return output_dir / f"{project.name}-final"
+        # Regular output directory (for real-time generation)
+        return output_dir / project.name
+    
+    async def _generate_output_files(self, project: Project, project_dir: Optional[Path] = None) -> None:
+        """Generate output Rust files
         
-        project_output_dir.mkdir(parents=True, exist_ok=True)
+        Args:
+            project: Project to generate files for
+            project_dir: Directory to write to; defaults to the regular
+                         (real-time) output directory
+        """
+        project_output_dir = project_dir if project_dir is not None else self._project_output_dir(project)
+        logger.info(f"Generating output files in: {project_output_dir}")
         
-        translated_count = 0
+        outputs: List[Tuple[Path, str]] = []
         for unit in project.units:
             # Check if translation result exists
             translation_result = unit.translation_result if unit.translation_result else project.get_unit_result(unit.id)
@@ -144,75 +160,54 @@ class Translator:
                 )
             
             if translation_result and translation_result.success and translation_result.translated_content:
-                # Determine output path preserving directory structure
-                try:
-                    relative_path = unit.path.relative_to(project.path)
-                except ValueError:
-                    # If paths are not related, use just the filename
-                    relative_path = Path(unit.path.name)
-                
-                # Create Rust file path
-                rust_file_path = project_output_dir / relative_path
-                rust_file_path = rust_file_path.with_suffix('.rs')
-                
-                # Create output directory
-                rust_file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Write translated content
-                with open(rust_file_path, 'w', encoding='utf-8') as f:
-                    f.write(translation_result.translated_content)
-                
-                translated_count += 1
-                logger.info(f"Generated: {rust_file_path}")
+                # Output path preserves the directory structure
+                relative_rs_path, _ = project.get_unit_output_path(unit)
+                rust_file_path = project_output_dir / relative_rs_path
+                outputs.append((rust_file_path, translation_result.translated_content))
             else:
                 logger.warning(f"No translation result for {unit.name}, skipping output")
         
-        logger.info(f"Generated {translated_count} translated files in {project_output_dir}")
+        # Create every output directory, the project root included, in one
+        # worker-thread pass, then write the files in worker threads, bounded
+        # to keep open FDs in check, alongside Cargo.toml
+        await asyncio.to_thread(
+            _make_dirs,
+            [project_output_dir] + [rust_file_path.parent for rust_file_path, _ in outputs]
+        )
+        semaphore = asyncio.Semaphore(_OUTPUT_WRITE_CONCURRENCY)
+        
+        async def write(rust_file_path: Path, content: str) -> None:
+            async with semaphore:
+                await asyncio.to_thread(_write_unit, rust_file_path, content)
+            logger.info(f"Generated: {rust_file_path}")
+        
+        await asyncio.gather(
+            *(write(rust_file_path, content) for rust_file_path, content in outputs),
+            self._generate_cargo_toml(project, project_output_dir)
+        )
         
-        # Generate Cargo.toml if needed
-        await self._generate_cargo_toml(project, project_output_dir)
+        logger.info(f"Generated {len(outputs)} translated files in {project_output_dir}")
     
     async def _generate_cargo_toml(self, project: Project, output_dir: Path) -> None:
         """Generate Cargo.toml for the Rust project"""
         cargo_toml_path = output_dir / "Cargo.toml"
         
-        # Safe project name for Cargo
-        safe_name = project.name.lower().replace(' ', '-').replace('_', '-')
-        # Remove special characters
-        safe_name = ''.join(c for c in safe_name if c.isalnum() or c == '-')
-        if not safe_name or safe_name[0].isdigit():
-            safe_name = f"translated-{safe_name}"
-        
-        cargo_content = f"""[package]
-name = "{safe_name}"
-version = "0.1.0"
-edition = "2021"
-
-[dependencies]
-# Add dependencies as needed
-# libc = "0.2"
-"""
-        
-        with open(cargo_toml_path, 'w', encoding='utf-8') as f:
-            f.write(cargo_content)
-        
-        logger.info(f"Generated: {cargo_toml_path}")
-        
         # Also generate .gitignore
         gitignore_path = output_dir / ".gitignore"
-        with open(gitignore_path, 'w', encoding='utf-8') as f:
-            f.write("/target/\nCargo.lock\n")
+        await asyncio.gather(
+            asyncio.to_thread(cargo_toml_path.write_text, cargo_toml_content(project.name), encoding='utf-8'),
+            asyncio.to_thread(gitignore_path.write_text, _GITIGNORE_CONTENT, encoding='utf-8')
+        )
+        
+        logger.info(f"Generated: {cargo_toml_path}")
     
     async def _verify_project_compilation(self, project: Project, project_dir: Optional[Path] = None) -> None:
         """Verify that the translated project compiles with detailed error analysis"""
         from ..utils.compilation_verifier import CompilationVerifier
         
-        if project_dir is None:
-            project_output_dir = Path(self.config.output.output_dir) / project.name
-        else:
-            project_output_dir = project_dir
+        project_output_dir = project_dir if project_dir is not None else self._project_output_dir(project)
         
-        if not (project_output_dir / "Cargo.toml").exists():
+        if not await asyncio.to_thread((project_output_dir / "Cargo.toml").exists):
             logger.warning("Cargo.toml not found, skipping compilation verification")
             return
         
@@ -231,26 +226,21 @@ edition = "2021"
                 logger.warning(f"⚠ Project compilation failed: {project.name}")
                 logger.warning(f"  Found {len(errors)} compilation errors")
                 
-                # Group errors by file
-                errors_by_file = {}
-                for err in errors:
-                    file_name = err.get("file", "unknown")
-                    if file_name not in errors_by_file:
-                        errors_by_file[file_name] = []
-                    errors_by_file[file_name].append(err)
-                
-                # Show top 5 errors
+                # Show the first 5 errors, at most 2 per file
                 shown = 0
-                for file_name, file_errors in list(errors_by_file.items())[:5]:
-                    for err in file_errors[:2]:  # Max 2 per file
-                        if shown < 5:
-                            logger.warning(f"  Error {shown+1}: {Path(file_name).name} - {err.get('message', '')[:80]}")
-                            shown += 1
-                            if shown >= 5:
-                                break
+                shown_per_file: Dict[str, int] = {}
+                for err in errors:
+                    if shown >= 5:
+                        break
+                    file_name = err.get("file") or "unknown"
+                    if shown_per_file.get(file_name, 0) >= 2:
+                        continue
+                    shown_per_file[file_name] = shown_per_file.get(file_name, 0) + 1
+                    shown += 1
+                    logger.warning(f"  Error {shown}: {Path(file_name).name} - {err.get('message', '')[:80]}")
                 
-                if len(errors) > 5:
-                    logger.warning(f"  ... and {len(errors) - 5} more errors")
+                if len(errors) > shown:
+                    logger.warning(f"  ... and {len(errors) - shown} more errors")
         
         except FileNotFoundError:
             logger.warning("cargo not found, skipping compilation verification")
@@ -261,44 +251,44 @@ edition = "2021"
         """Verify modules compilation independently, checking each module's integrity"""
         from ..utils.compilation_verifier import CompilationVerifier
         
-        if project_dir is None:
-            project_output_dir = Path(self.config.output.output_dir) / project.name
-        else:
-            project_output_dir = project_dir
+        project_output_dir = project_dir if project_dir is not None else self._project_output_dir(project)
         
         # Group files by directory to identify modules
-        modules = {}
+        modules = defaultdict(list)
         for unit in project.units:
             if unit.status == TranslationStatus.COMPLETED and unit.translated_content:
-                try:
-                    relative_path = unit.path.relative_to(project.path)
-                    module_dir = relative_path.parent
-                    if module_dir not in modules:
-                        modules[module_dir] = []
+                _, module_dir = project.get_unit_output_path(unit)
+                if module_dir is not None:
                     modules[module_dir].append(unit)
-                except ValueError:
-                    continue
         
         logger.info(f"Found {len(modules)} potential modules, verifying compilation")
         
-        verified_modules = 0
-        failed_modules = 0
+        # verify_module takes the module path per call, so one verifier
+        # serves every module; checks run concurrently, one per CPU at most
+        # so parallel rustc builds don't oversubscribe the machine
+        verifier = CompilationVerifier(project_output_dir)
+        semaphore = asyncio.Semaphore(os.cpu_count() or 1)
         
-        for module_dir, units in modules.items():
+        async def verify(module_dir: Path) -> Optional[bool]:
             module_path = project_output_dir / module_dir
             
             # Check if this is a Rust module (has Cargo.toml)
-            if (module_path / "Cargo.toml").exists():
-                verifier = CompilationVerifier(module_path)
+            if not await asyncio.to_thread((module_path / "Cargo.toml").exists):
+                return None
+            
+            async with semaphore:
                 result = await verifier.verify_module(module_path)
-                
-                if result["success"]:
-                    verified_modules += 1
-                    logger.debug(f"✓ Module verified: {module_dir}")
-                else:
-                    failed_modules += 1
-                    error_count = result.get("error_count", 0)
-                    logger.warning(f"⚠ Module failed: {module_dir} ({error_count} errors)")
+            
+            if result["success"]:
+                logger.debug(f"✓ Module verified: {module_dir}")
+            else:
+                error_count = result.get("error_count", 0)
+                logger.warning(f"⚠ Module failed: {module_dir} ({error_count} errors)")
+            return result["success"]
+        
+        results = await asyncio.gather(*(verify(module_dir) for module_dir in modules))
+        verified_modules = results.count(True)
+        failed_modules = results.count(False)
         
         logger.info(f"Module verification: {verified_modules} passed, {failed_modules} failed")
     
@@ -315,50 +305,32 @@ edition = "2021"
     async def resume_translation(self) -> None:
         """Resume translation from last snapshot"""
         # Find latest snapshot
-        state_dir = self.state_manager.state_dir
-        snapshot_files = list(state_dir.glob("snapshot_*.json"))
+        latest_snapshot_file = await self.state_manager.find_latest_snapshot()
         
-        if not snapshot_files:
+        if latest_snapshot_file is None:
             logger.warning("No snapshots found to resume from")
             return
         
-        # Load latest snapshot
-        latest_snapshot_file = max(snapshot_files, key=lambda f: f.stat().st_mtime)
-        
-        with open(latest_snapshot_file, 'r') as f:
-            snapshot_data = f.read()
-        
         # Restore from snapshot
-        from ..core.state_manager import StateSnapshot
-        snapshot = StateSnapshot(**json.loads(snapshot_data))
+        snapshot = await self.state_manager.load_snapshot(latest_snapshot_file)
         await self.state_manager.restore_snapshot(snapshot)
         
         logger.info(f"Translation resumed from snapshot: {snapshot.timestamp}")
     
-    async def _cleanup_duplicate_states(self, current_project_id: str, project_path: Path) -> None:
-        """Clean up duplicate state files for the same project path"""
-        state_dir = self.state_manager.state_dir
-        project_files = list(state_dir.glob("project_*.json"))
+    async def _remove_duplicate_states(self, duplicate_ids: List[str]) -> None:
+        """Remove the state files of duplicate projects for the same path"""
+        if not duplicate_ids:
+            return
         
-        cleaned = 0
-        for project_file in project_files:
-            try:
-                with open(project_file, 'r') as f:
-                    project_data = json.load(f)
-                    stored_path = Path(project_data.get('path', '')).resolve()
-                    stored_id = project_data.get('id')
-                    
-                    # If same path but different ID, remove the duplicate
-                    if stored_path == project_path.resolve() and stored_id != current_project_id:
-                        project_file.unlink()
-                        cleaned += 1
-                        logger.info(f"Removed duplicate state file: {project_file.name}")
-            except Exception as e:
-                logger.debug(f"Error checking project file {project_file}: {e}")
-                continue
+        try:
+            await self.state_manager.remove_projects(duplicate_ids)
+        except Exception as e:
+            logger.debug(f"Error removing duplicate project states: {e}")
+            return
         
-        if cleaned > 0:
-            logger.info(f"Cleaned up {cleaned} duplicate state file(s)")
+        for project_id in duplicate_ids:
+            logger.info(f"Removed duplicate state file: project_{project_id}.json")
+        logger.info(f"Cleaned up {len(duplicate_ids)} duplicate state file(s)")
     
     async def cleanup(self) -> None:
         """Clean up resources"""
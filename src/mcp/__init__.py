@@ -3,15 +3,62 @@ MCP (Model Context Protocol) integration module for enhanced LLM interactions
 """
 
 import asyncio
+import hashlib
 import json
+import os
+import re
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 from loguru import logger
 
 from ..models.config import Config
 from ..models.project import TranslationUnit, Project
+from ..utils.compilation_verifier import CompilationVerifier
+from ..utils.jsonio import loads
+
+# Dependency statements for analyze_dependencies. The include target is
+# kept to one line so an unterminated `#include <` can't make each match
+# attempt scan the rest of the file.
+_RUST_USE_RE = re.compile(r'use\s+([\w:]+)')
+_C_INCLUDE_RE = re.compile(r'#include[ \t]*[<"]([^>"\n]+)[>"]')
+
+# Pieces of an LLM translation response
+_RUST_CODE_RE = re.compile(r'```rust\n?(.*?)\n?```', re.DOTALL)
+_CONFIDENCE_RE = re.compile(r'confidence[:\s]+([\d.]+)', re.IGNORECASE)
+
+# Longest cargo JSON message line accepted while streaming its output;
+# rendered diagnostics can exceed asyncio's 64 KiB default
+_CARGO_LINE_LIMIT = 1 << 20
+
+
+def _read_cached_response(cache_file: Path) -> Optional[Dict[str, Any]]:
+    """Read a cached LLM response, or None if missing or unreadable (blocking)"""
+    try:
+        return loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_response(cache_file: Path, response: Dict[str, Any]) -> None:
+    """Write an LLM response to the cache atomically (blocking)"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp.{os.getpid()}")
+    tmp_file.write_text(json.dumps(response), encoding='utf-8')
+    os.replace(tmp_file, cache_file)
+
+
+def _read_source_file(file_path: Path) -> str:
+    """Read a source file, ignoring undecodable bytes (blocking)"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def _write_source_file(file_path: Path, content: str) -> None:
+    """Write a file, creating its directory (blocking)"""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(content, encoding='utf-8')
 
 
 @dataclass
@@ -31,6 +78,19 @@ class MCPContext:
     compilation_context: Dict[str, Any]
     translation_history: List[Dict[str, Any]]
     metadata: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary without asdict()'s recursive deep copy
+        
+        The field values are shared, so the result must be treated as read-only.
+        """
+        return {
+            "files": self.files,
+            "dependencies": self.dependencies,
+            "compilation_context": self.compilation_context,
+            "translation_history": self.translation_history,
+            "metadata": self.metadata
+        }
 
 
 class MCPClient:
@@ -40,8 +100,32 @@ class MCPClient:
         self.config = config
         self.tools: Dict[str, MCPTool] = {}
         self.contexts: Dict[str, MCPContext] = {}
+        self._llm_client = None
+        # Compile checks share one scratch crate, so they take turns
+        self._compile_lock = asyncio.Lock()
         self._register_tools()
     
+    def _get_llm_client(self):
+        """Get the shared async LLM client, creating it on first use
+        
+        One client keeps its connection pool across requests, so concurrent
+        unit translations share connections instead of each opening its own.
+        """
+        if self._llm_client is None:
+            import openai
+            self._llm_client = openai.AsyncOpenAI(
+                api_key=self.config.model.api_key,
+                base_url=self.config.model.base_url,
+                timeout=self.config.model.timeout
+            )
+        return self._llm_client
+    
+    async def close(self) -> None:
+        """Close the LLM client, if one was created; the next request opens a new one"""
+        if self._llm_client is not None:
+            client, self._llm_client = self._llm_client, None
+            await client.close()
+    
     def _register_tools(self):
         """Register available MCP tools"""
         self.tools = {
@@ -166,21 +250,14 @@ class MCPClient:
     
     async def _read_file(self, path: str) -> str:
         """Read file contents"""
-        file_path = Path(path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
-        
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+        try:
+            return await asyncio.to_thread(_read_source_file, Path(path))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {path}") from None
     
     async def _write_file(self, path: str, content: str) -> bool:
         """Write file contents"""
-        file_path = Path(path)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
+        await asyncio.to_thread(_write_source_file, Path(path), content)
         return True
     
     async def _compile_check(self, code: str, dependencies: List[str], project_dir: Optional[str] = None, filepath: Optional[str] = None) -> Dict[str, Any]:
@@ -194,7 +271,6 @@ class MCPClient:
         """
         # If project_dir is provided, use real project context for accurate verification
         if project_dir:
-            from ..utils.compilation_verifier import CompilationVerifier
             verifier = CompilationVerifier(Path(project_dir))
             
             if filepath:
@@ -205,9 +281,9 @@ class MCPClient:
             
             return result
         
-        # Fallback: temporary directory check (legacy behavior)
-        import tempfile
-        
+        # Fallback: check the code alone in a scratch crate. The crate is kept
+        # between calls so cargo reuses its resolved dependencies and
+        # incremental build state; only src/main.rs changes per call.
         result = {
             "success": False,
             "errors": [],
@@ -215,47 +291,39 @@ class MCPClient:
         }
         
         try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                cargo_toml = f"""[package]
-name = "temp_check"
-version = "0.1.0"
-edition = "2021"
-
-[dependencies]
-"""
-                for dep in dependencies:
-                    cargo_toml += f'{dep} = "*"\n'
-                
-                (Path(tmpdir) / "Cargo.toml").write_text(cargo_toml)
-                (Path(tmpdir) / "src").mkdir(exist_ok=True)
-                (Path(tmpdir) / "src" / "main.rs").write_text(code)
+            async with self._compile_lock:
+                scratch_dir = await asyncio.to_thread(self._prepare_scratch_crate, code, dependencies)
                 
                 proc = await asyncio.create_subprocess_exec(
                     "cargo", "check", "--message-format", "json",
-                    cwd=tmpdir,
+                    cwd=scratch_dir,
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=_CARGO_LINE_LIMIT
                 )
                 
-                stdout, stderr = await proc.communicate()
-                
-                # Parse JSON output for detailed errors
+                # Parse JSON messages as cargo emits them; stderr is drained
+                # alongside so neither pipe can fill up and stall cargo
+                stderr_task = asyncio.create_task(proc.stderr.read())
                 errors = []
-                for line in stdout.decode('utf-8', errors='ignore').split('\n'):
-                    if line.strip():
-                        try:
-                            msg = json.loads(line)
-                            if msg.get("reason") == "compiler-message":
-                                error_msg = msg.get("message", {})
-                                if error_msg.get("level") == "error":
-                                    errors.append({
-                                        "message": error_msg.get("message", ""),
-                                        "code": error_msg.get("code"),
-                                        "rendered": error_msg.get("rendered", ""),
-                                        "spans": error_msg.get("spans", [])
-                                    })
-                        except:
-                            pass
+                async for line in proc.stdout:
+                    if not line.strip():
+                        continue
+                    try:
+                        msg = loads(line)
+                    except ValueError:
+                        continue
+                    if msg.get("reason") == "compiler-message":
+                        error_msg = msg.get("message", {})
+                        if error_msg.get("level") == "error":
+                            errors.append({
+                                "message": error_msg.get("message", ""),
+                                "code": error_msg.get("code"),
+                                "rendered": error_msg.get("rendered", ""),
+                                "spans": error_msg.get("spans", [])
+                            })
+                stderr = await stderr_task
+                await proc.wait()
                 
                 if proc.returncode == 0:
                     result["success"] = True
@@ -267,35 +335,66 @@ edition = "2021"
         
         return result
     
+    def _prepare_scratch_crate(self, code: str, dependencies: List[str]) -> Path:
+        """Write code into the scratch crate used by compile checks (blocking)"""
+        scratch_dir = Path(self.config.output.output_dir) / ".mcp_check"
+        (scratch_dir / "src").mkdir(parents=True, exist_ok=True)
+        
+        cargo_toml = f"""[package]
+name = "temp_check"
+version = "0.1.0"
+edition = "2021"
+
+[dependencies]
+"""
+        # A repeated key would make the manifest invalid
+        for dep in dict.fromkeys(dependencies):
+            cargo_toml += f'{dep} = "*"\n'
+        
+        # Rewriting an unchanged manifest would make cargo re-resolve
+        cargo_toml_path = scratch_dir / "Cargo.toml"
+        try:
+            unchanged = cargo_toml_path.read_text() == cargo_toml
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            cargo_toml_path.write_text(cargo_toml)
+        
+        (scratch_dir / "src" / "main.rs").write_text(code, encoding='utf-8')
+        return scratch_dir
+    
     async def _analyze_dependencies(self, code: str, language: str) -> List[str]:
         """Analyze dependencies in code"""
         dependencies = []
         
         if language == "rust":
             # Extract use statements
-            import re
-            use_pattern = r'use\s+([\w:]+)'
-            matches = re.findall(use_pattern, code)
+            matches = _RUST_USE_RE.findall(code)
             dependencies = [m.replace('::', '/') for m in matches]
         
         elif language in ["c", "cpp"]:
             # Extract include statements
-            import re
-            include_pattern = r'#include\s*[<"]([^>"]+)[>"]'
-            matches = re.findall(include_pattern, code)
+            matches = _C_INCLUDE_RE.findall(code)
             dependencies = matches
         
-        return dependencies
+        # Each dependency once, in first-seen order
+        return list(dict.fromkeys(dependencies))
+    
+    def _response_cache_file(self, system_prompt: str, user_prompt: str, temperature: float) -> Optional[Path]:
+        """Get the cache file for an LLM request, or None if it shouldn't be cached"""
+        model = self.config.model
+        if not model.cache_responses or (temperature > 0 and not model.cache_sampled_responses):
+            return None
+        
+        # The prompts carry the source, languages and context
+        key = hashlib.blake2b(digest_size=16)
+        for part in (model.model_name, model.base_url or "", str(model.max_tokens), f"{temperature:.2f}", system_prompt, user_prompt):
+            key.update(part.encode('utf-8'))
+            key.update(b'\0')
+        return Path(self.config.output.output_dir) / ".llm_cache" / f"{key.hexdigest()}.json"
     
     async def _suggest_translation(self, source_code: str, source_lang: str, target_lang: str, context: Dict[str, Any], temperature: Optional[float] = None) -> Dict[str, Any]:
         """Suggest translation using LLM with MCP context"""
-        import openai
-        
-        client = openai.OpenAI(
-            api_key=self.config.model.api_key,
-            base_url=self.config.model.base_url
-        )
-        
         # Build enhanced prompt with MCP context
         system_prompt = """You are an expert code translator specializing in C/C++ to Rust translation.
 Use the provided MCP tools to:
@@ -322,9 +421,19 @@ Provide:
 2. Translation confidence (0-1)
 3. Any suggestions or notes about the translation"""
         
+        use_temp = temperature if temperature is not None else self.config.model.temperature
+        
+        # Identical requests from earlier runs reuse the stored response
+        cache_file = self._response_cache_file(system_prompt, user_prompt, use_temp)
+        if cache_file is not None:
+            cached = await asyncio.to_thread(_read_cached_response, cache_file)
+            if cached is not None:
+                logger.info(f"LLM response cache hit: {cache_file.name}")
+                return cached
+        
+        client = self._get_llm_client()
+        
         try:
-            use_temp = temperature if temperature is not None else self.config.model.temperature
-            
             # Log API request details (to file and console)
             logger.info(f"LLM API Request: model={self.config.model.model_name}, temperature={use_temp:.2f}, "
                        f"max_tokens={self.config.model.max_tokens}, base_url={self.config.model.base_url}")
@@ -335,7 +444,7 @@ Provide:
             logger.info(f"LLM System Prompt: {system_prompt}")
             
             # Make API call (note: top_p is removed, using OpenAI SDK default)
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=self.config.model.model_name,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -361,11 +470,10 @@ Provide:
             logger.debug(f"LLM Full Response: {content}")
             
             # Parse response
-            import re
-            code_match = re.search(r'```rust\n?(.*?)\n?```', content, re.DOTALL)
+            code_match = _RUST_CODE_RE.search(content)
             translated_code = code_match.group(1) if code_match else ""
             
-            confidence_match = re.search(r'confidence[:\s]+([\d.]+)', content, re.IGNORECASE)
+            confidence_match = _CONFIDENCE_RE.search(content)
             confidence = float(confidence_match.group(1)) if confidence_match else 0.5
             
             # Log translation result
@@ -384,12 +492,21 @@ Provide:
                 "finish_reason": finish_reason
             }
             
-            return {
+            result = {
                 "translated_code": translated_code,
                 "confidence": confidence,
                 "suggestions": content.split('\n')[-5:],  # Last 5 lines as suggestions
                 "conversation": conversation_entry  # Full conversation history
             }
+            
+            # Only responses with code are worth replaying
+            if cache_file is not None and translated_code:
+                try:
+                    await asyncio.to_thread(_write_cached_response, cache_file, result)
+                except OSError as e:
+                    logger.debug(f"Failed to cache LLM response: {e}")
+            
+            return result
         
         except Exception as e:
             logger.error(f"LLM API call failed: {e}", exc_info=True)
@@ -448,27 +565,30 @@ class MCPTranslator:
         
         # Read source code
         source_code = await self.mcp_client.call_tool("read_file", {"path": str(unit.path)})
+        source_lang = "cpp" if unit.path.suffix in [".cpp", ".hpp"] else "c"
         
-        # Analyze dependencies
-        deps = await self.mcp_client.call_tool(
-            "analyze_dependencies",
-            {
-                "code": source_code,
-                "language": "cpp" if unit.path.suffix in [".cpp", ".hpp"] else "c"
-            }
-        )
-        
-        # Get translation suggestion with dynamic temperature
+        # Get translation suggestion with dynamic temperature; dependency
+        # analysis is only needed for the compilation check, so it runs
+        # alongside the translation request rather than before it
         use_temp = temperature if temperature is not None else self.config.model.temperature
-        suggestion = await self.mcp_client.call_tool(
-            "suggest_translation",
-            {
-                "source_code": source_code,
-                "source_lang": "cpp" if unit.path.suffix in [".cpp", ".hpp"] else "c",
-                "target_lang": "rust",
-                "context": asdict(context),
-                "temperature": use_temp
-            }
+        deps, suggestion = await asyncio.gather(
+            self.mcp_client.call_tool(
+                "analyze_dependencies",
+                {
+                    "code": source_code,
+                    "language": source_lang
+                }
+            ),
+            self.mcp_client.call_tool(
+                "suggest_translation",
+                {
+                    "source_code": source_code,
+                    "source_lang": source_lang,
+                    "target_lang": "rust",
+                    "context": context.to_dict(),
+                    "temperature": use_temp
+                }
+            )
         )
         
         translated_code = suggestion.get("translated_code", "")
@@ -489,10 +609,9 @@ class MCPTranslator:
             # High confidence, verify compilation in actual project context
             try:
                 rust_file_path = project_output_dir / relative_path.with_suffix('.rs')
-                rust_file_path.parent.mkdir(parents=True, exist_ok=True)
                 
                 # Write file for context-aware compilation
-                rust_file_path.write_text(translated_code)
+                await asyncio.to_thread(_write_source_file, rust_file_path, translated_code)
                 
                 # Check compilation in actual project directory for context-aware verification
                 compile_result = await self.mcp_client.call_tool(
@@ -2,6 +2,7 @@
 Configuration management for CStarX v2.0
 """
 
+import os
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from pydantic import BaseModel, Field
@@ -34,6 +35,11 @@ class ModelConfig(BaseModel):
     temperature: float = Field(default=1.0, ge=0.0, le=2.0)
     max_tokens: int = Field(default=8192, ge=1, le=32768)
     timeout: int = Field(default=60, ge=1, le=300)
+    # Reuse earlier responses to identical requests across runs. Only
+    # temperature-0 requests are cached unless sampled ones are opted in,
+    # since retries at a nonzero temperature want a fresh sample.
+    cache_responses: bool = True
+    cache_sampled_responses: bool = False
     
     model_config = {"protected_namespaces": ()}
 
@@ -106,8 +112,6 @@ class Config(BaseModel):
     @classmethod
     def from_env(cls) -> "Config":
         """Load configuration from environment variables"""
-        import os
-        
         # Try to load .env file if it exists
         env_path = Path(".env")
         if env_path.exists():
@@ -2,11 +2,11 @@
 Data models for CStarX v2.0
 """
 
-from typing import Dict, List, Optional, Set, Any, Union
+from typing import Dict, List, Optional, Set, Any, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 import uuid
 
 
@@ -62,6 +62,7 @@ class TranslationUnit(BaseModel):
     
     # Metadata
     size: int = Field(default=0, description="File size in bytes")
+    mtime_ns: Optional[int] = Field(default=None, description="File modification time in nanoseconds")
     complexity_score: float = Field(default=0.0, ge=0.0, le=1.0)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
@@ -139,6 +140,10 @@ class Project(BaseModel):
     # Configuration
     config: Optional[Dict[str, Any]] = Field(default=None)
     
+    # Unit ID -> (relative .rs path, module directory); unit paths never
+    # change, so entries stay valid for the life of the project
+    _output_paths: Dict[str, Tuple[Path, Optional[Path]]] = PrivateAttr(default_factory=dict)
+    
     def add_unit(self, unit: TranslationUnit) -> None:
         """Add a translation unit to the project"""
         self.units.append(unit)
@@ -151,7 +156,76 @@ class Project(BaseModel):
     
     def get_ready_units(self, completed_units: Set[str]) -> List[TranslationUnit]:
         """Get units ready for translation"""
-        return [unit for unit in self.units if unit.is_ready_for_translation(completed_units, project=self)]
+        # Resolve each dependency path to a unit ID once per call instead of
+        # once per dependent unit (find_unit_by_path is a linear scan)
+        resolved: Dict[str, Optional[str]] = {}
+        return [
+            unit for unit in self.units
+            if all(dep_id in completed_units for dep_id in self._resolve_dependency_ids(unit, resolved))
+        ]
+    
+    def get_dependency_map(self) -> Dict[str, Set[str]]:
+        """Map each unit ID to the IDs of the project units it depends on"""
+        resolved: Dict[str, Optional[str]] = {}
+        dependency_map = {}
+        for unit in self.units:
+            dep_ids = self._resolve_dependency_ids(unit, resolved)
+            dep_ids.discard(unit.id)
+            dependency_map[unit.id] = dep_ids
+        return dependency_map
+    
+    def get_depth_levels(self, dependency_map: Optional[Dict[str, Set[str]]] = None) -> List[List[TranslationUnit]]:
+        """Group units into dependency depth levels
+        
+        Units in a level only depend on units in earlier levels, so each level
+        can be translated concurrently. Units caught in dependency cycles are
+        placed together in a final level.
+        """
+        if dependency_map is None:
+            dependency_map = self.get_dependency_map()
+        dependents: Dict[str, List[TranslationUnit]] = {unit.id: [] for unit in self.units}
+        in_degree: Dict[str, int] = {}
+        
+        for unit in self.units:
+            dep_ids = dependency_map[unit.id]
+            in_degree[unit.id] = len(dep_ids)
+            for dep_id in dep_ids:
+                dependents[dep_id].append(unit)
+        
+        # Kahn's algorithm, one frontier per level
+        levels = []
+        current = [unit for unit in self.units if in_degree[unit.id] == 0]
+        placed = 0
+        while current:
+            levels.append(current)
+            placed += len(current)
+            next_level = []
+            for unit in current:
+                for dependent in dependents[unit.id]:
+                    in_degree[dependent.id] -= 1
+                    if in_degree[dependent.id] == 0:
+                        next_level.append(dependent)
+            current = next_level
+        
+        if placed < len(self.units):
+            levels.append([unit for unit in self.units if in_degree[unit.id] > 0])
+        
+        return levels
+    
+    def _resolve_dependency_ids(self, unit: TranslationUnit, resolved: Dict[str, Optional[str]]) -> Set[str]:
+        """Map a unit's project dependencies to unit IDs, memoizing lookups in `resolved`"""
+        dep_ids = set()
+        for dep_path in unit.get_dependencies():
+            # Filter out system includes (like /usr/include/*)
+            if dep_path.startswith('/usr/include'):
+                continue
+            if dep_path not in resolved:
+                dep_unit = self.find_unit_by_path(dep_path)
+                resolved[dep_path] = dep_unit.id if dep_unit else None
+            dep_id = resolved[dep_path]
+            if dep_id is not None:
+                dep_ids.add(dep_id)
+        return dep_ids
     
     def update_statistics(self) -> None:
         """Update project statistics"""
@@ -160,6 +234,39 @@ class Project(BaseModel):
         self.failed_files = len(self.get_units_by_status(TranslationStatus.FAILED))
         self.updated_at = datetime.now()
     
+    def set_unit_status(self, unit: TranslationUnit, status: TranslationStatus) -> None:
+        """Move a unit to a new status, keeping the file counters in step
+        
+        Counts are adjusted in place rather than rescanning every unit;
+        update_statistics() remains the full recompute.
+        """
+        for old_status, delta in ((unit.status, -1), (status, 1)):
+            if old_status == TranslationStatus.COMPLETED:
+                self.translated_files += delta
+            elif old_status == TranslationStatus.FAILED:
+                self.failed_files += delta
+        unit.status = status
+        self.updated_at = datetime.now()
+    
+    def get_unit_output_path(self, unit: TranslationUnit) -> Tuple[Path, Optional[Path]]:
+        """Get a unit's Rust output path relative to the output root and its module directory
+        
+        The output mirrors the unit's place under the project root; units
+        outside the root keep just their file name and have no module
+        directory (None).
+        """
+        output_path = self._output_paths.get(unit.id)
+        if output_path is None:
+            try:
+                relative_path = unit.path.relative_to(self.path)
+                module_dir = relative_path.parent
+            except ValueError:
+                relative_path = Path(unit.path.name)
+                module_dir = None
+            output_path = (relative_path.with_suffix('.rs'), module_dir)
+            self._output_paths[unit.id] = output_path
+        return output_path
+    
     def get_unit_result(self, unit_id: str) -> Optional['TranslationResult']:
         """Get translation result for a unit"""
         for unit in self.units:
@@ -169,10 +276,11 @@ class Project(BaseModel):
     
     def find_unit_by_path(self, path: str) -> Optional['TranslationUnit']:
         """Find a unit by its file path"""
-        path_obj = Path(path)
+        # Resolve the lookup path once, not once per unit
+        resolved_path = str(Path(path).resolve())
         for unit in self.units:
             # Try exact match first
-            if str(unit.path) == path or str(unit.path.resolve()) == str(path_obj.resolve()):
+            if str(unit.path) == path or str(unit.path.resolve()) == resolved_path:
                 return unit
             # Try relative path match
             try:
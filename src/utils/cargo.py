@@ -0,0 +1,30 @@
+"""
+Cargo manifest helpers shared by the translator and the agent orchestrator
+"""
+
+import functools
+import re
+
+# Characters not allowed in Cargo package names
+_SAFE_NAME_RE = re.compile(r'[^a-z0-9-]+')
+
+
+@functools.lru_cache(maxsize=32)
+def cargo_toml_content(project_name: str) -> str:
+    """Build the Cargo.toml for a project, once per project name"""
+    # Safe project name for Cargo
+    safe_name = project_name.lower().replace(' ', '-').replace('_', '-')
+    # Remove special characters
+    safe_name = _SAFE_NAME_RE.sub('', safe_name)
+    if not safe_name or safe_name[0].isdigit():
+        safe_name = f"translated-{safe_name}"
+    
+    return f"""[package]
+name = "{safe_name}"
+version = "0.1.0"
+edition = "2021"
+
+[dependencies]
+# Add dependencies as needed
+# libc = "0.2"
+"""
@@ -9,12 +9,13 @@ Features:
 """
 
 import asyncio
-import json
 import subprocess
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from loguru import logger
 
+from .jsonio import loads
+
 
 class CompilationError:
     """Detailed compilation error information"""
@@ -112,7 +113,8 @@ class CompilationVerifier:
                     "warning_count": 0,
                     "timeout": True
                 }
-            output_lines = stdout.decode('utf-8', errors='ignore').split('\n')
+            # Messages are parsed straight from bytes, one JSON object per line
+            output_lines = stdout.split(b'\n')
             stderr_output = stderr.decode('utf-8', errors='ignore')
             
             compile_errors = []
@@ -123,7 +125,7 @@ class CompilationVerifier:
                     continue
                 
                 try:
-                    cargo_output = json.loads(output_line)
+                    cargo_output = loads(output_line)
                     
                     if cargo_output.get("reason") != "compiler-message":
                         continue
@@ -141,21 +143,8 @@ class CompilationVerifier:
                         continue
                     
                     # Filter by filepaths if specified
-                    if filepaths:
-                        spans = compiler_message.get("spans", [])
-                        is_relevant = False
-                        for span in spans:
-                            file_name = span.get("file_name", "")
-                            # Check if this file is in our target list
-                            for target_file in filepaths:
-                                if target_file in file_name or file_name.endswith(target_file):
-                                    is_relevant = True
-                                    break
-                            if is_relevant:
-                                break
-                        
-                        if not is_relevant:
-                            continue
+                    if filepaths and not self._spans_match(compiler_message.get("spans", []), filepaths):
+                        continue
                     
                     # Extract error information
                     error_data = {
@@ -175,7 +164,7 @@ class CompilationVerifier:
                     elif level == "warning":
                         warnings.append(error_obj)
                 
-                except (json.JSONDecodeError, KeyError) as e:
+                except (ValueError, KeyError) as e:
                     logger.debug(f"Failed to parse cargo output line: {e}")
                     continue
             
@@ -211,11 +200,56 @@ class CompilationVerifier:
                 "warning_count": 0
             }
     
+    @staticmethod
+    def _spans_match(spans: List[Dict[str, Any]], target_files: List[str]) -> bool:
+        """Check whether any span points into one of the target files"""
+        for span in spans:
+            file_name = span.get("file_name", "")
+            # Check if this file is in our target list
+            for target_file in target_files:
+                if target_file in file_name or file_name.endswith(target_file):
+                    return True
+        return False
+    
     async def verify_file(self, filepath: str) -> Dict[str, Any]:
         """Verify a specific file compiles in project context"""
         relative_path = Path(filepath).relative_to(self.project_dir) if Path(filepath).is_absolute() else filepath
         return await self.cargo_check(filepaths=[str(relative_path)])
     
+    async def verify_batch(self, filepaths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Verify several files with a single cargo check
+        
+        Diagnostics are mapped back to the files they point at, so each
+        per-file result has the same shape as verify_file's.
+        
+        Returns:
+            Dict mapping each given file path to its verification result
+        """
+        if not filepaths:
+            return {}
+        
+        result = await self.cargo_check()
+        
+        results = {}
+        for filepath in filepaths:
+            target = str(Path(filepath).relative_to(self.project_dir)) if Path(filepath).is_absolute() else filepath
+            # Failures without spans (timeout, cargo missing) apply to every file
+            errors = [
+                e for e in result["errors"]
+                if "spans" not in e or self._spans_match(e["spans"], [target])
+            ]
+            warnings = [w for w in result["warnings"] if self._spans_match(w.get("spans", []), [target])]
+            results[filepath] = {
+                "success": len(errors) == 0,
+                "errors": errors,
+                "warnings": warnings,
+                "output": result["output"],
+                "error_count": len(errors),
+                "warning_count": len(warnings)
+            }
+        
+        return results
+    
     async def verify_module(self, module_path: Path) -> Dict[str, Any]:
         """Verify a module compiles independently"""
         module_path = Path(module_path).resolve()
@@ -261,7 +295,7 @@ class CompilationVerifier:
                     "timeout": True
                 }
             
-            output_lines = stdout.decode('utf-8', errors='ignore').split('\n')
+            output_lines = stdout.split(b'\n')
             stderr_output = stderr.decode('utf-8', errors='ignore')
             
             test_errors = []
@@ -269,16 +303,16 @@ class CompilationVerifier:
                 if not line.strip():
                     continue
                 try:
-                    msg = json.loads(line)
-                    if msg.get("reason") == "compiler-message":
-                        error_msg = msg.get("message", {})
-                        if error_msg.get("level") == "error":
-                            test_errors.append({
-                                "message": error_msg.get("message", ""),
-                                "rendered": error_msg.get("rendered", "")
-                            })
-                except:
-                    pass
+                    msg = loads(line)
+                except ValueError:
+                    continue
+                if msg.get("reason") == "compiler-message":
+                    error_msg = msg.get("message", {})
+                    if error_msg.get("level") == "error":
+                        test_errors.append({
+                            "message": error_msg.get("message", ""),
+                            "rendered": error_msg.get("rendered", "")
+                        })
             
             return {
                 "success": proc.returncode == 0 and len(test_errors) == 0,
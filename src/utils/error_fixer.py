@@ -24,6 +24,24 @@ class ErrorFixer:
         self.config = config
         self.max_fix_attempts = 5
         self.max_errors_per_fix = 20  # Limit errors to avoid token overflow
+        self._llm_client = None
+    
+    def _get_llm_client(self):
+        """Get the shared async LLM client, creating it on first use"""
+        if self._llm_client is None:
+            import openai
+            self._llm_client = openai.AsyncOpenAI(
+                api_key=self.config.model.api_key,
+                base_url=self.config.model.base_url,
+                timeout=self.config.model.timeout
+            )
+        return self._llm_client
+    
+    async def close(self) -> None:
+        """Close the LLM client, if one was created; the next fix opens a new one"""
+        if self._llm_client is not None:
+            client, self._llm_client = self._llm_client, None
+            await client.close()
     
     async def fix_compile_errors(
         self,
@@ -149,12 +167,7 @@ class ErrorFixer:
         project_context: Optional[Dict[str, Any]]
     ) -> str:
         """Request LLM to fix compilation errors"""
-        import openai
-        
-        client = openai.OpenAI(
-            api_key=self.config.model.api_key,
-            base_url=self.config.model.base_url
-        )
+        client = self._get_llm_client()
         
         # Build system prompt
         system_prompt = """You are an expert Rust compiler error fixer. Your task is to analyze compilation errors and provide corrected code.
@@ -192,7 +205,7 @@ Please provide the complete corrected Rust code. Return ONLY the corrected code
             
             logger.info(f"Requesting LLM fix: {len(errors)} errors, temperature={fix_temperature:.2f}")
             
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=self.config.model.model_name,
                 messages=[
                     {"role": "system", "content": system_prompt},
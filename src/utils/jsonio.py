@@ -0,0 +1,32 @@
+"""
+JSON encoding helpers for CStarX v2.0
+
+Uses orjson when it is installed and falls back to the standard library.
+Both backends raise ValueError subclasses on malformed input.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to compact JSON bytes
+    
+    Output is meant for machines, so no indentation is spent on it.
+    Non-string dict keys are converted as the json module would.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=default)
+    return json.dumps(obj, separators=(',', ':'), default=default).encode('utf-8')
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
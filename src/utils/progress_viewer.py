@@ -3,7 +3,6 @@ Progress viewer utility for CStarX v2.0
 用于查看翻译进度的工具
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -13,9 +12,40 @@ from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn,
 from rich.panel import Panel
 from rich import box
 
+from ..core.state_manager import read_unit_deltas
+from .jsonio import loads
+
 console = Console()
 
 
+def _read_project_state(project_file: Path) -> Dict[str, Any]:
+    """Read a project state file with its pending unit deltas applied
+    
+    During a run unit updates only go to project_<id>.delta.jsonl until the
+    next compaction, so the project file alone under-reports progress.
+    """
+    data = loads(project_file.read_bytes())
+    delta_file = project_file.with_name(f"{project_file.stem}.delta.jsonl")
+    
+    units = data.setdefault('units', [])
+    unit_index = None
+    for delta in read_unit_deltas(delta_file):
+        if unit_index is None:
+            unit_index = {unit.get('id'): i for i, unit in enumerate(units)}
+        unit = delta['unit']
+        if unit.get('id') in unit_index:
+            units[unit_index[unit.get('id')]] = unit
+        else:
+            unit_index[unit.get('id')] = len(units)
+            units.append(unit)
+        
+        data['translated_files'] = delta['translated_files']
+        data['failed_files'] = delta['failed_files']
+        data['updated_at'] = delta['updated_at']
+    
+    return data
+
+
 class ProgressViewer:
     """View translation progress from state files"""
     
@@ -35,8 +65,7 @@ class ProgressViewer:
         
         for project_file in self.state_dir.glob("project_*.json"):
             try:
-                with open(project_file, 'r') as f:
-                    data = json.load(f)
+                data = _read_project_state(project_file)
                 
                 # Calculate progress
                 total = data.get('total_files', 0)
@@ -69,8 +98,7 @@ class ProgressViewer:
         if not project_file.exists():
             return None
         
-        with open(project_file, 'r') as f:
-            data = json.load(f)
+        data = _read_project_state(project_file)
         
         # Analyze units by status
         units = data.get('units', [])
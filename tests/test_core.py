@@ -4,14 +4,18 @@ Unit tests for CStarX v2.0
 
 import pytest
 import asyncio
+import json
+import os
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from cstarx.models.config import Config, ModelProvider, TranslationStrategy
-from cstarx.models.project import Project, TranslationUnit, TranslationUnitType, TranslationStatus
+from cstarx.models.config import Config, DependencyConfig, ModelProvider, TranslationStrategy
+from cstarx.models.project import Project, TranslationUnit, TranslationUnitType, TranslationStatus, TranslationSession
 from cstarx.core.dependency_analyzer import DependencyAnalyzer, DependencyGraph
 from cstarx.core.state_manager import StateManager
 from cstarx.agents.orchestrator import AgentOrchestrator
+from cstarx.utils.compilation_verifier import CompilationVerifier
+from cstarx.mcp import MCPClient
 
 
 class TestConfig:
@@ -144,6 +148,63 @@ class TestProject:
         assert project.translated_files == 1
         assert project.failed_files == 1
 
+        # Status transitions keep the counters in step without a rescan
+        project.set_unit_status(unit2, TranslationStatus.IN_PROGRESS)
+        project.set_unit_status(unit2, TranslationStatus.COMPLETED)
+
+        assert unit2.status == TranslationStatus.COMPLETED
+        assert project.translated_files == 2
+        assert project.failed_files == 0
+
+    def test_project_ready_units(self):
+        """Test ready units follow completed dependencies"""
+        project = Project(
+            name="test_project",
+            path=Path("test_project")
+        )
+
+        header = TranslationUnit(
+            name="header.h",
+            path=Path("header.h"),
+            type=TranslationUnitType.PURE_HEADER
+        )
+        impl = TranslationUnit(
+            name="main.cpp",
+            path=Path("main.cpp"),
+            type=TranslationUnitType.COMPLETE
+        )
+        impl.add_dependency("header.h", "include")
+
+        project.add_unit(header)
+        project.add_unit(impl)
+
+        assert project.get_ready_units(set()) == [header]
+        assert project.get_ready_units({header.id}) == [header, impl]
+
+        # Headers come first, dependents in the following level
+        assert project.get_depth_levels() == [[header], [impl]]
+
+    def test_unit_output_path(self):
+        """Test output paths mirror the project layout"""
+        project = Project(
+            name="test_project",
+            path=Path("test_project")
+        )
+
+        nested = TranslationUnit(
+            name="util.c",
+            path=Path("test_project/lib/util.c"),
+            type=TranslationUnitType.PURE_IMPL
+        )
+        outside = TranslationUnit(
+            name="other.c",
+            path=Path("elsewhere/other.c"),
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        assert project.get_unit_output_path(nested) == (Path("lib/util.rs"), Path("lib"))
+        assert project.get_unit_output_path(outside) == (Path("other.rs"), None)
+
 
 class TestDependencyAnalyzer:
     """Test dependency analysis"""
@@ -196,6 +257,120 @@ class TestDependencyAnalyzer:
         sorted_nodes = analyzer.topological_sort(graph, use_dfs=False)
         assert len(sorted_nodes) == 3
 
+    def test_topological_sort_cached(self):
+        """Test sorting an unchanged graph again reuses the cached order"""
+        units = [
+            TranslationUnit(
+                name="main.cpp",
+                path=Path("main.cpp"),
+                type=TranslationUnitType.PURE_IMPL
+            ),
+            TranslationUnit(
+                name="header.h",
+                path=Path("header.h"),
+                type=TranslationUnitType.PURE_HEADER
+            )
+        ]
+        units[0].add_dependency("header.h", "include")
+
+        analyzer = DependencyAnalyzer(Mock())
+        first = analyzer.topological_sort(analyzer.build_dependency_graph(units))
+
+        with patch.object(analyzer, "_topological_sort_dfs") as sort:
+            second = analyzer.topological_sort(analyzer.build_dependency_graph(units))
+
+        sort.assert_not_called()
+        assert second == first == ["header.h", "main.cpp"]
+
+        # A different edge set is sorted afresh, not served from the cache
+        units[0].dependencies = []
+        units[1].add_dependency("main.cpp", "include")
+        assert analyzer.topological_sort(analyzer.build_dependency_graph(units)) == ["main.cpp", "header.h"]
+
+    def test_topological_sort_deep_chain(self):
+        """Test DFS sort handles chains deeper than the recursion limit"""
+        analyzer = DependencyAnalyzer(Mock())
+
+        depth = 5000
+        nodes = {str(i) for i in range(depth)}
+        edges = {str(i): {str(i + 1)} for i in range(depth - 1)}
+        edges[str(depth - 1)] = set()
+
+        graph = DependencyGraph(nodes, edges, {}, {})
+        sorted_nodes = analyzer.topological_sort(graph, use_dfs=True)
+
+        # Dependencies come before their dependents
+        assert sorted_nodes == [str(i) for i in reversed(range(depth))]
+
+    @pytest.mark.asyncio
+    async def test_dependency_cache(self, tmp_path):
+        """Test unchanged files reuse cached dependencies"""
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        (source_dir / "header.h").write_text("int f(void);\n")
+        (source_dir / "main.c").write_text('#include "header.h"\nint main() { return f(); }\n')
+
+        analyzer = DependencyAnalyzer(DependencyConfig(), tmp_path / "state")
+        project = await analyzer.analyze_project(source_dir)
+        assert (tmp_path / "state" / "dep_cache.json").exists()
+
+        # A fresh analyzer answers from the cache without rescanning sources
+        analyzer = DependencyAnalyzer(DependencyConfig(), tmp_path / "state")
+        with patch.object(DependencyAnalyzer, "_scan_includes") as scan:
+            cached_project = await analyzer.analyze_project(source_dir)
+
+        scan.assert_not_called()
+        main_unit = next(u for u in cached_project.units if u.name == "main.c")
+        assert main_unit.get_dependencies() == [str(source_dir / "header.h")]
+
+    @pytest.mark.asyncio
+    async def test_dependency_cache_staleness(self, tmp_path):
+        """Test cached includes are re-resolved and other projects' entries kept"""
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        (source_dir / "main.c").write_text('#include "missing.h"\nint main() { return 0; }\n')
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        (other_dir / "lib.c").write_text("int g(void) { return 0; }\n")
+
+        analyzer = DependencyAnalyzer(DependencyConfig(), tmp_path / "state")
+        project = await analyzer.analyze_project(source_dir)
+        assert project.units[0].get_dependencies() == []
+
+        # A header that appears later is picked up although main.c is unchanged
+        (source_dir / "missing.h").write_text("int f(void);\n")
+        project = await analyzer.analyze_project(source_dir)
+        main_unit = next(u for u in project.units if u.name == "main.c")
+        assert main_unit.get_dependencies() == [str(source_dir / "missing.h")]
+
+        # Analyzing another project keeps the first one's entries
+        await analyzer.analyze_project(other_dir)
+        analyzer = DependencyAnalyzer(DependencyConfig(), tmp_path / "state")
+        with patch.object(DependencyAnalyzer, "_scan_includes") as scan:
+            await analyzer.analyze_project(source_dir)
+        scan.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_system_headers_not_dependencies(self, tmp_path):
+        """Test includes resolving outside the project are not recorded"""
+        system_dir = tmp_path / "sys"
+        system_dir.mkdir()
+        (system_dir / "stdio.h").write_text("int printf(const char *, ...);\n")
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        (source_dir / "header.h").write_text("int f(void);\n")
+        (source_dir / "main.c").write_text('#include <stdio.h>\n#include "header.h"\nint main() { return f(); }\n')
+
+        analyzer = DependencyAnalyzer(DependencyConfig())
+        with patch.object(
+            DependencyAnalyzer, "_query_system_include_paths", return_value=(system_dir,)
+        ) as query:
+            project = await analyzer.analyze_project(source_dir)
+
+        # A C-only project queries the C include path
+        query.assert_called_once_with("c")
+        main_unit = next(u for u in project.units if u.name == "main.c")
+        assert main_unit.get_dependencies() == [str(source_dir / "header.h")]
 
 class TestStateManager:
     """Test state management"""
@@ -242,7 +417,255 @@ class TestStateManager:
         assert loaded_project is not None
         assert loaded_project.name == project.name
         assert len(loaded_project.units) == 1
-    
+
+    @pytest.mark.asyncio
+    async def test_source_content_blob(self, state_manager, temp_dir):
+        """Test source content is stored once and referenced by hash"""
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=temp_dir / "test.cpp",
+            type=TranslationUnitType.PURE_IMPL,
+            original_content="int main() { return 0; }\n"
+        )
+
+        project.add_unit(unit)
+        await state_manager.save_project(project)
+        await state_manager.save_unit(project, unit)
+
+        assert len(list((temp_dir / "state" / "blobs").glob("*.z"))) == 1
+        project_file = temp_dir / "state" / f"project_{project.id}.json"
+        assert "int main" not in project_file.read_text()
+
+        loaded_project = await state_manager.load_project(project.id)
+        assert loaded_project.units[0].original_content == unit.original_content
+
+    @pytest.mark.asyncio
+    async def test_failed_blob_write_retried(self, state_manager, temp_dir):
+        """Test a blob whose write failed is written by the next save"""
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=temp_dir / "test.cpp",
+            type=TranslationUnitType.PURE_IMPL,
+            original_content="int main() { return 0; }\n"
+        )
+
+        project.add_unit(unit)
+        with patch("cstarx.core.state_manager._write_blobs", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                await state_manager.save_project(project)
+
+        await state_manager.save_project(project)
+        loaded_project = await state_manager.load_project(project.id)
+        assert loaded_project.units[0].original_content == unit.original_content
+
+    @pytest.mark.asyncio
+    async def test_save_unit_delta(self, state_manager, temp_dir):
+        """Test per-unit deltas are replayed on load"""
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=temp_dir / "test.cpp",
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        project.add_unit(unit)
+        await state_manager.save_project(project)
+
+        # Update a single unit without rewriting the project
+        unit.status = TranslationStatus.COMPLETED
+        unit.translated_content = "fn main() {}"
+        project.update_statistics()
+        await state_manager.save_unit(project, unit)
+
+        loaded_project = await state_manager.load_project(project.id)
+
+        assert loaded_project.units[0].status == TranslationStatus.COMPLETED
+        assert loaded_project.units[0].translated_content == "fn main() {}"
+        assert loaded_project.translated_files == 1
+
+        # A full save folds the delta log back into the project file
+        await state_manager.save_project(loaded_project)
+        assert not list(temp_dir.glob("state/*.jsonl"))
+
+    @pytest.mark.asyncio
+    async def test_delta_during_save_project(self, state_manager, temp_dir):
+        """Test a unit saved while a full save is in flight is kept"""
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=temp_dir / "test.cpp",
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        project.add_unit(unit)
+        full_save = asyncio.create_task(state_manager.save_project(project))
+        await asyncio.sleep(0)
+
+        unit.status = TranslationStatus.COMPLETED
+        await state_manager.save_unit(project, unit)
+        await full_save
+
+        loaded_project = await state_manager.load_project(project.id)
+        assert loaded_project.units[0].status == TranslationStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_progress_viewer_reads_deltas(self, state_manager, temp_dir):
+        """Test the progress viewer counts units not yet compacted"""
+        pytest.importorskip("rich")
+        from cstarx.utils.progress_viewer import ProgressViewer
+
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=temp_dir / "test.cpp",
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        project.add_unit(unit)
+        await state_manager.save_project(project)
+
+        unit.status = TranslationStatus.COMPLETED
+        project.update_statistics()
+        await state_manager.save_unit(project, unit)
+
+        viewer = ProgressViewer(temp_dir / "state")
+        assert viewer.list_projects()[0]['translated_files'] == 1
+        assert viewer.get_project_details(project.id)['status_counts'] == {'completed': 1}
+
+    @pytest.mark.asyncio
+    async def test_delta_log_compaction(self, state_manager, temp_dir):
+        """Test a long delta log is folded into the project file"""
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=temp_dir / "test.cpp",
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        project.add_unit(unit)
+        await state_manager.save_project(project)
+
+        state_manager.DELTA_COMPACT_THRESHOLD = 3
+        await state_manager.save_units(project, [unit, unit])
+        assert list(temp_dir.glob("state/*.jsonl"))
+
+        unit.status = TranslationStatus.COMPLETED
+        await state_manager.save_unit(project, unit)
+        assert not list(temp_dir.glob("state/*.jsonl"))
+
+        loaded_project = await state_manager.load_project(project.id)
+        assert loaded_project.units[0].status == TranslationStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_snapshot_roundtrip(self, state_manager, temp_dir):
+        """Test snapshots load back with their unit ID sets"""
+        project = Project(
+            name="test_project",
+            path=temp_dir
+        )
+        session = TranslationSession(
+            project_id=project.id,
+            completed_units={"a", "b"},
+            failed_units={"c"},
+            total_units=3
+        )
+        await state_manager.save_project(project)
+        await state_manager.save_session(session)
+
+        snapshot = await state_manager.create_snapshot()
+        snapshot_file = await state_manager.find_latest_snapshot()
+        loaded = await state_manager.load_snapshot(snapshot_file)
+
+        assert loaded == snapshot
+
+    @pytest.mark.asyncio
+    async def test_path_index(self, state_manager, config, temp_dir):
+        """Test saved projects are indexed by path"""
+        first = Project(name="test_project", path=temp_dir)
+        second = Project(name="test_project", path=temp_dir)
+        await state_manager.save_project(first)
+        await state_manager.save_project(second)
+
+        assert await state_manager.find_project_ids(temp_dir) == [first.id, second.id]
+
+        await state_manager.remove_projects([first.id])
+        assert await state_manager.find_project_ids(temp_dir) == [second.id]
+        assert not (temp_dir / "state" / f"project_{first.id}.json").exists()
+
+        # A fresh manager reads the persisted index
+        reloaded = StateManager(config)
+        assert await reloaded.find_project_ids(temp_dir) == [second.id]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_updates_path_index(self, state_manager, config, temp_dir):
+        """Test cleaning up old projects drops them from the path index"""
+        old = Project(name="test_project", path=temp_dir)
+        new = Project(name="test_project", path=temp_dir)
+        await state_manager.save_project(old)
+        await state_manager.save_project(new)
+
+        # Age everything but the newer project's file, index included
+        state_dir = temp_dir / "state"
+        for state_file in state_dir.glob("*.json"):
+            if state_file.name != f"project_{new.id}.json":
+                os.utime(state_file, (0, 0))
+
+        await state_manager.cleanup_old_states(days=1)
+
+        assert (state_dir / "path_index.json").exists()
+        assert await state_manager.find_project_ids(temp_dir) == [new.id]
+        assert await StateManager(config).find_project_ids(temp_dir) == [new.id]
+
+    @pytest.mark.asyncio
+    async def test_blob_cleanup(self, state_manager, temp_dir):
+        """Test removing a project deletes blobs only it referenced"""
+        projects = []
+        for content in ("int a;\n", "int b;\n"):
+            project = Project(name="test_project", path=temp_dir)
+            project.add_unit(TranslationUnit(
+                name="test.c",
+                path=temp_dir / "test.c",
+                type=TranslationUnitType.PURE_IMPL,
+                original_content=content
+            ))
+            await state_manager.save_project(project)
+            projects.append(project)
+
+        blob_dir = temp_dir / "state" / "blobs"
+        assert len(list(blob_dir.glob("*.z"))) == 2
+
+        await state_manager.remove_projects([projects[0].id])
+        assert len(list(blob_dir.glob("*.z"))) == 1
+
+        loaded_project = await state_manager.load_project(projects[1].id)
+        assert loaded_project.units[0].original_content == "int b;\n"
+
     @pytest.mark.asyncio
     async def test_state_summary(self, state_manager):
         """Test state summary"""
@@ -270,6 +693,186 @@ class TestAgentOrchestrator:
         assert orchestrator.translator is not None
         assert orchestrator.quality_agent is not None
 
+    def test_complexity_calculation(self, orchestrator):
+        """Test complexity scoring and caching"""
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=Path("test.cpp"),
+            type=TranslationUnitType.PURE_IMPL,
+            original_content="template <typename T>\nclass Foo {\n  void bar() {\n"
+        )
+
+        tech_leader = orchestrator.tech_leader
+        complexity = tech_leader._calculate_complexity(unit)
+
+        # 4 lines, 2 unbalanced braces, 1 class, 1 template
+        assert complexity == pytest.approx(4 / 1000 + 2 / 100 + 1 / 50 + 1 / 20)
+        assert tech_leader._complexity_cache[(unit.id, len(unit.original_content))] == complexity
+
+    @pytest.mark.asyncio
+    async def test_streamed_complexity(self, orchestrator, tmp_path):
+        """Test complexity measured from disk matches the in-memory score"""
+        content = "template <typename T>\nclass Foo {\n  void bar() {\n"
+        source = tmp_path / "test.cpp"
+        source.write_text(content)
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=source,
+            type=TranslationUnitType.PURE_IMPL,
+            original_content=content
+        )
+
+        # Small chunks so markers straddle chunk boundaries
+        with patch("cstarx.agents.orchestrator._MEASURE_CHUNK_SIZE", 5):
+            streamed = await orchestrator.tech_leader._measure_complexity(source)
+
+        assert streamed == pytest.approx(orchestrator.tech_leader._calculate_complexity(unit))
+
+    @pytest.mark.asyncio
+    async def test_stop_saver_waits_for_save(self, orchestrator):
+        """Test stopping the saver lets an in-progress save finish"""
+        save_started = asyncio.Event()
+        release = asyncio.Event()
+        saved = []
+
+        async def save_units(project, units):
+            save_started.set()
+            await release.wait()
+            saved.extend(units)
+
+        state_manager = Mock()
+        state_manager.save_units = save_units
+        project = Project(name="test_project", path=Path("."))
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=Path("test.cpp"),
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        with patch.object(AgentOrchestrator, "SAVE_INTERVAL", 0):
+            orchestrator._start_saver(project, state_manager)
+            orchestrator._schedule_unit_save(unit)
+            await save_started.wait()
+
+            stop = asyncio.create_task(orchestrator._stop_saver())
+            await asyncio.sleep(0)
+            assert not stop.done()
+
+            release.set()
+            await stop
+
+        assert saved == [unit]
+
+    @pytest.mark.asyncio
+    async def test_saver_retries_failed_save(self, orchestrator):
+        """Test a failed save leaves the saver running and retries the units"""
+        attempts = []
+
+        async def save_units(project, units):
+            attempts.append(list(units))
+            if len(attempts) == 1:
+                raise OSError("disk full")
+
+        state_manager = Mock()
+        state_manager.save_units = save_units
+        project = Project(name="test_project", path=Path("."))
+        unit = TranslationUnit(
+            name="test.cpp",
+            path=Path("test.cpp"),
+            type=TranslationUnitType.PURE_IMPL
+        )
+
+        with patch.object(AgentOrchestrator, "SAVE_INTERVAL", 0):
+            orchestrator._start_saver(project, state_manager)
+            orchestrator._schedule_unit_save(unit)
+            for _ in range(10):
+                if len(attempts) == 2:
+                    break
+                await asyncio.sleep(0)
+            await orchestrator._stop_saver()
+
+        assert attempts == [[unit], [unit]]
+
+
+class TestMCPClient:
+    """Test MCP client"""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        """Create MCP client writing to a temporary output directory"""
+        config = Config()
+        config.output.output_dir = tmp_path
+        return MCPClient(config)
+
+    @pytest.mark.asyncio
+    async def test_response_cache_hit(self, client, tmp_path):
+        """Test a cached response is returned without calling the LLM"""
+        cached = {
+            "translated_code": "fn main() {}",
+            "confidence": 0.9,
+            "suggestions": [],
+            "conversation": {"response": "fn main() {}"}
+        }
+        cache_file = tmp_path / "cached.json"
+        cache_file.write_text(json.dumps(cached))
+
+        with patch.object(client, "_response_cache_file", return_value=cache_file):
+            result = await client._suggest_translation("int main() {}", "c", "rust", {}, 0.0)
+
+        assert result == cached
+
+    @pytest.mark.asyncio
+    async def test_analyze_dependencies(self, client):
+        """Test include and use statements are extracted"""
+        c_code = '#include <stdio.h>\n#include <broken\n#include "util.h"\n#include <stdio.h>\n'
+        assert await client._analyze_dependencies(c_code, "c") == ["stdio.h", "util.h"]
+        assert await client._analyze_dependencies("use std::io;\n", "rust") == ["std/io"]
+
+    @pytest.mark.asyncio
+    async def test_close(self, client):
+        """Test closing releases the shared LLM client"""
+        llm_client = AsyncMock()
+        client._llm_client = llm_client
+
+        await client.close()
+        await client.close()
+
+        llm_client.close.assert_awaited_once()
+        assert client._llm_client is None
+
+    def test_response_cache_key(self, client):
+        """Test only identical deterministic requests share a cache entry"""
+        cache_file = client._response_cache_file("system", "user", 0.0)
+        assert cache_file == client._response_cache_file("system", "user", 0.0)
+        assert cache_file != client._response_cache_file("system", "other", 0.0)
+
+        # Sampled requests skip the cache by default
+        assert client._response_cache_file("system", "user", 0.7) is None
+
+
+class TestCompilationVerifier:
+    """Test compilation verification"""
+
+    @pytest.mark.asyncio
+    async def test_verify_batch_groups_by_file(self, tmp_path):
+        """Test one cargo check is split into per-file results"""
+        verifier = CompilationVerifier(tmp_path)
+        verifier.cargo_check = AsyncMock(return_value={
+            "success": False,
+            "errors": [{"message": "mismatched types", "spans": [{"file_name": "src/a.rs"}]}],
+            "warnings": [{"message": "unused variable", "spans": [{"file_name": "src/b.rs"}]}],
+            "output": "",
+            "error_count": 1,
+            "warning_count": 1
+        })
+
+        results = await verifier.verify_batch([str(tmp_path / "src/a.rs"), str(tmp_path / "src/b.rs")])
+
+        verifier.cargo_check.assert_awaited_once_with()
+        assert results[str(tmp_path / "src/a.rs")]["error_count"] == 1
+        assert results[str(tmp_path / "src/b.rs")]["success"]
+        assert results[str(tmp_path / "src/b.rs")]["warning_count"] == 1
+
 
 # Integration tests
 class TestIntegration: